@@ -1,16 +1,130 @@
-from flask import Flask, request, jsonify, send_file, abort, render_template_string
-import pandas as pd
-import numpy as np
-from sqlalchemy import func, or_
+from flask import Flask, Request, Response, request, jsonify, send_file, abort, render_template_string
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS, cross_origin
-from contextlib import closing
+from contextlib import closing, contextmanager
 from werkzeug.utils import secure_filename
+from werkzeug.datastructures import MultiDict
 from pathlib import Path
-import os, MySQLdb, mimetypes, json, datetime, joblib, tempfile, shutil, hashlib, subprocess, shlex
-import sys, importlib.util, re, time
-from MySQLdb.cursors import DictCursor
+from urllib.parse import quote
+import os, MySQLdb, mimetypes, json, datetime, tempfile, shutil, hashlib, subprocess, shlex
+import sys, importlib.util, re, time, functools, uuid, unicodedata, threading, queue, atexit, signal
+from concurrent.futures import ThreadPoolExecutor
+from MySQLdb.cursors import DictCursor, SSCursor
+from MySQLdb.constants import CLIENT
+from cachetools import LRUCache, TTLCache
+from dbutils.pooled_db import PooledDB
+
+# JSON helpers: orjson when installed, stdlib json otherwise (same data, compact vs spaced output)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    def _dumps(obj) -> str:
+        """Serialise obj to a JSON str (UTF-8, non-ASCII kept as-is)"""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    _loads = orjson.loads
+else:
+    def _dumps(obj) -> str:
+        """Serialise obj to a JSON str (UTF-8, non-ASCII kept as-is)"""
+        return json.dumps(obj, ensure_ascii=False)
+
+    _loads = json.loads
+
+# Pre-serialised JSON embedded verbatim by orjson (orjson >= 3.9)
+_JSON_FRAGMENT = getattr(orjson, "Fragment", None) if orjson is not None else None
+
+# Serialised empty list, used for JSON columns that start out empty
+_EMPTY_JSON_ARRAY = "[]"
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, used by request.get_json() and jsonify()
+
+    Values orjson does not handle the same way as Flask (dates, Decimal, dataclasses, __html__)
+    are passed through to Flask's default hook, so responses keep Flask's formats.
+    numpy scalars/arrays (e.g. model outputs) are serialised natively.
+    """
+    def dumps(self, obj, **kwargs) -> str:
+        options = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                   | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        return orjson.dumps(obj, default=self.default, option=options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def _upload_dir() -> Path:
+    """
+    Directory uploaded PDFs are stored in (where downloads look for files)
+
+    Returns:
+        pathlib.Path: file_base_directory, created if missing
+    """
+    base_dir = Path(os.getenv("file_base_directory", "/data/source_files"))
+    base_dir.mkdir(parents=True, exist_ok=True)
+    return base_dir
+
+def _upload_staging_dir() -> Path:
+    """
+    Directory in-flight uploads are spooled to: a subdirectory of the upload directory,
+    so finished uploads are renamed into place on the same filesystem
+
+    Returns:
+        pathlib.Path: <file_base_directory>/.staging, created if missing
+    """
+    staging_dir = _upload_dir() / ".staging"
+    staging_dir.mkdir(exist_ok=True)
+    return staging_dir
+
+def _sweep_upload_staging(max_age: float = 86400) -> None:
+    """
+    Remove .part files left in the staging directory by workers killed mid-upload
+
+    Args:
+        max_age (float, optional): Only parts older than this many seconds are removed,
+            so uploads in progress in other workers are left alone - Defaults to a day
+    """
+    try:
+        cutoff = time.time() - max_age
+        for part in _upload_staging_dir().glob("*.part"):
+            if part.stat().st_mtime < cutoff:
+                part.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+class UploadRequest(Request):
+    """
+    Request whose multipart file parts on /api/upload_file are spooled by werkzeug straight
+    into a named .part file in the upload staging directory (instead of an anonymous temp
+    file), so the handler can rename the upload into place rather than copy it again.
+    Other routes keep werkzeug's default file streams.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._spooled_parts = []
+        self._staging_dir = None
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.endpoint != "upload_file":
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        if self._staging_dir is None:
+            self._staging_dir = _upload_staging_dir()
+        part = tempfile.NamedTemporaryFile("w+b", suffix=".pdf.part", dir=self._staging_dir, delete=False)
+        self._spooled_parts.append(part.name)
+        return part
+
+    def close(self) -> None:
+        # Parts the handler did not move into place (rejected uploads, errors) are removed
+        super().close()
+        for name in self._spooled_parts:
+            Path(name).unlink(missing_ok=True)
 
 app = Flask(__name__)
+app.request_class = UploadRequest
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 # -----------------------------------------------------
 # 💡 FIX: CORS is set to the correct Vite port 5173
@@ -20,6 +134,13 @@ CORS(app,
      supports_credentials=True)
 # -----------------------------------------------------
 
+@app.errorhandler(500)
+def internal_error(e):
+    """
+    Return unhandled errors as JSON; Flask has already logged the traceback
+    """
+    return jsonify({"error": "internal_error"}), 500
+
 # ---- Upload / pipeline config ----
 app.config.setdefault("UPLOAD_FOLDER", os.getenv("UPLOAD_FOLDER", "./uploads"))
 app.config.setdefault("MAX_CONTENT_LENGTH", int(os.getenv("MAX_UPLOAD_MB", "50")) * 1024 * 1024)
@@ -30,9 +151,11 @@ DATA_DIR = BASE_DIR / "data"
 SRC_DIR  = DATA_DIR / "source_files"
 TXT_DIR  = DATA_DIR / "text_extracted"
 JSON_DIR = DATA_DIR / "json_output"
+JOBS_DIR = Path(app.config["UPLOAD_FOLDER"]) / "jobs"
 
-for _d in (Path(app.config["UPLOAD_FOLDER"]), SRC_DIR, TXT_DIR, JSON_DIR):
+for _d in (Path(app.config["UPLOAD_FOLDER"]), SRC_DIR, TXT_DIR, JSON_DIR, JOBS_DIR):
     _d.mkdir(parents=True, exist_ok=True)
+_sweep_upload_staging()
 
 def _allowed_pdf(filename: str) -> bool:
     """
@@ -89,36 +212,122 @@ def _run(cmd, env_extra=None, timeout=900):
             - returncode (int): Process return code (0 on success)
             - stdout (str): Captured standard output (stripped)
             - stderr (str): Captured standard error (stripped)
+
+    Raises:
+        subprocess.TimeoutExpired: If the process outlives the timeout, after
+            its whole process group has been killed
     """
     env = dict(os.environ)
     if env_extra: env.update(env_extra)
-    p = subprocess.run(shlex.split(cmd), cwd=str(BASE_DIR), capture_output=True, text=True, timeout=timeout, env=env)
-    return p.returncode, p.stdout.strip(), p.stderr.strip()
+    # own session so a timeout also kills the tools it spawned (e.g. ghostscript)
+    with subprocess.Popen(shlex.split(cmd), cwd=str(BASE_DIR), stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          text=True, env=env, start_new_session=True) as p:
+        try:
+            out, err = p.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(p.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            p.communicate()
+            raise
+    return p.returncode, out.strip(), err.strip()
+
+# ---- Database connection pool ----
+# Created lazily so that each gunicorn worker (after fork) owns its own pool.
+# Keep workers * DB_POOL_MAX_CONNECTIONS below MySQL's max_connections (151 by default),
+# and DB_POOL_MAX_CONNECTIONS at least 2x the gthread threads per worker: blocking=True waits
+# when the pool is exhausted, and the background executors take connections too.
+_db_pool = None
+_db_pool_lock = threading.Lock()
+
+def _get_pool() -> PooledDB:
+    """
+    Return the process-wide MySQL connection pool, creating it on first use
+
+    Args:
+        None
+
+    Returns:
+        dbutils.pooled_db.PooledDB: Pool of MySQLdb connections to the quizbank database
+    """
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                _db_pool = PooledDB(
+                    creator=MySQLdb,
+                    mincached=int(os.getenv("DB_POOL_MIN_CACHED", "5")),
+                    maxcached=int(os.getenv("DB_POOL_MAX_CACHED", "20")),
+                    maxconnections=int(os.getenv("DB_POOL_MAX_CONNECTIONS", "40")),
+                    blocking=True,  # wait for a free connection instead of failing under load
+                    ping=1,         # check (and reconnect) a connection when it is taken from the pool
+                    # lets _insert_question send INSERT + base-id UPDATE in one round trip;
+                    # all SQL here is parameterised, so this does not open stacked-query injection
+                    client_flag=CLIENT.MULTI_STATEMENTS,
+                    # explicit so _transaction() always sees one transaction ended by one commit,
+                    # even if the server's init_connect or default enables autocommit
+                    autocommit=False,
+                    host=os.getenv("MYSQL_HOST", "db"),
+                    user=os.getenv("MYSQL_USER", "quizbank_user"),
+                    passwd=os.getenv("MYSQL_PASSWORD","quizbank_pass"),
+                    db=os.getenv("MYSQL_DATABASE", "quizbank"),
+                )
+    return _db_pool
 
 def get_connection():
     """
-    Create a new MySQL connection using environment variables:
-    MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE.
+    Borrow a MySQL connection from the process-wide pool. Connection settings come from
+    environment variables: MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE.
+    Calling .close() (e.g. via contextlib.closing) rolls back anything uncommitted and
+    returns the connection to the pool.
 
     Args:
         None.
 
     Returns:
-        MYSQLdb.connection: Open a connection to the quizbank database.
+        Pooled MySQLdb connection to the quizbank database.
 
     Raises:
         MySQLdb.Error: If connection cannot be established. 
     """
-    return MySQLdb.connect(
-        host=os.getenv("MYSQL_HOST", "db"),
-        user=os.getenv("MYSQL_USER", "quizbank_user"),
-        passwd=os.getenv("MYSQL_PASSWORD","quizbank_pass"),
-        db=os.getenv("MYSQL_DATABASE", "quizbank"),
-    )
+    return _get_pool().connection()
+
+@contextmanager
+def _transaction():
+    """
+    Borrow a pooled connection for one transaction
+    Commits if the block completes, rolls back if it raises, and returns the connection
+    to the pool either way (`with conn:` on a pooled connection only closes it, it does not commit)
+
+    Args:
+        None
+
+    Yields:
+        Pooled MySQLdb connection
+
+    Raises:
+        Re-raises any exception from the block after rolling back
+    """
+    conn = get_connection()
+    try:
+        yield conn
+        conn.commit()
+        # every _transaction() block writes questions or files
+        _invalidate_get_question_caches()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+# has_column answers by (table, col); the schema does not change while the app runs
+_HAS_COLUMN_CACHE = {}
 
 def has_column(conn, table: str, col: str) -> bool:
     """
     Check whether a given column exists in a table in the current database
+    Only the first call per (table, col) queries INFORMATION_SCHEMA; later calls use _HAS_COLUMN_CACHE
 
     Args:
         conn: An open DB-API compatible database connection
@@ -129,15 +338,20 @@ def has_column(conn, table: str, col: str) -> bool:
         bool: `True` if the column exists on the table in the current database,
         `False` otherwise
     """
-    with closing(conn.cursor()) as c:
-        c.execute("""
-            SELECT COUNT(*)
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = DATABASE()
-              AND TABLE_NAME = %s
-              AND COLUMN_NAME = %s
-        """, (table, col))
-        return c.fetchone()[0] == 1
+    key = (table, col)
+    found = _HAS_COLUMN_CACHE.get(key)
+    if found is None:
+        with closing(conn.cursor()) as c:
+            c.execute("""
+                SELECT COUNT(*)
+                FROM INFORMATION_SCHEMA.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+                  AND TABLE_NAME = %s
+                  AND COLUMN_NAME = %s
+            """, (table, col))
+            found = c.fetchone()[0] == 1
+        _HAS_COLUMN_CACHE[key] = found
+    return found
 
 # ---- Utility Helper Functions ----
 def parse_json_field(field_json):
@@ -156,7 +370,7 @@ def parse_json_field(field_json):
     if not field_json:
         return None
     try:
-        return json.loads(field_json)
+        return _loads(field_json)
     except Exception:
         return field_json
     
@@ -180,6 +394,34 @@ def ts(v):
     else:
         return str(v)
 
+def _json_response(obj, status: int = 200):
+    """
+    Serialise a payload with orjson (stdlib json if unavailable) and wrap it in a JSON response
+    Faster than jsonify for large payloads, and serialises datetime/date as ISO 8601
+
+    Args:
+        obj (Any): JSON-serialisable payload (dict/list)
+        status (int): HTTP status code - Defaults to 200
+
+    Returns:
+        flask.Response: application/json response
+    """
+    return Response(_encode_json(obj), status=status, mimetype="application/json")
+
+def _encode_json(obj):
+    """
+    Serialise a response payload, with datetime/date as ISO 8601
+
+    Args:
+        obj (Any): JSON-serialisable payload
+
+    Returns:
+        bytes/str: JSON text (bytes from orjson, str from the stdlib fallback)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False, default=ts)
+
 def _get_file_row(file_id: int):
     """
     Fetch file metadata from files table using its primary key
@@ -192,7 +434,8 @@ def _get_file_row(file_id: int):
             "id": int,
             "file_name": str,
             "file_path" str, 
-            "uploaded_at": datetime.datetime
+            "uploaded_at": datetime.datetime,
+            "course", "year", "semester", "assessment_type": file metadata
         }
     
     Raises:
@@ -200,9 +443,76 @@ def _get_file_row(file_id: int):
     """
     with closing(get_connection()) as conn:
         cur = conn.cursor(MySQLdb.cursors.DictCursor)
-        cur.execute("SELECT id, file_name, file_path, uploaded_at FROM files WHERE id=%s", (file_id,))
+        cur.execute("""
+            SELECT id, file_name, file_path, uploaded_at,
+                   course, year, semester, assessment_type
+            FROM files WHERE id=%s
+        """, (file_id,))
         return cur.fetchone()
 
+# Per-process caches of small rows read by downloads and /addquestion (files by id, questions by id).
+# Misses are not cached, so new rows show up at once; other workers may serve a deleted
+# row until the TTL expires.
+_ROW_CACHE_TTL = int(os.getenv("FILE_ROW_CACHE_TTL", "60"))
+_FILE_ROW_CACHE = TTLCache(maxsize=2048, ttl=_ROW_CACHE_TTL)
+_QUESTION_ROW_CACHE = TTLCache(maxsize=4096, ttl=_ROW_CACHE_TTL)
+# get_file_id results by normalised (course, year, semester, assessment_type, latest)
+_FILE_ID_CACHE = TTLCache(maxsize=1024, ttl=_ROW_CACHE_TTL)
+_ROW_CACHE_LOCK = threading.Lock()
+
+def _cached_row(cache: TTLCache, key, loader):
+    """
+    Return cache[key], loading and caching it on a miss
+    The returned row is shared with the cache and must not be modified
+
+    Args:
+        cache (TTLCache): One of the row caches above
+        key (Hashable): Primary key of the row (the lookup key for _FILE_ID_CACHE)
+        loader (callable): Fetches the row for key, returning None if it does not exist
+
+    Returns:
+        dict/None: Row, or None if it does not exist (not cached)
+    """
+    with _ROW_CACHE_LOCK:
+        row = cache.get(key)
+    if row is None:
+        row = loader(key)
+        if row is not None:
+            with _ROW_CACHE_LOCK:
+                cache[key] = row
+    return row
+
+def _get_file_row_cached(file_id: int):
+    """
+    Same as _get_file_row, served from a short-lived in-process cache when possible
+
+    Args:
+        file_id (int): file_id of the desired file
+
+    Returns:
+        dict/None: File row, or None if no such file
+    """
+    return _cached_row(_FILE_ROW_CACHE, file_id, _get_file_row)
+
+def _invalidate_cached_row(cache: TTLCache, key) -> None:
+    """
+    Drop a row from one of the row caches after it is changed or deleted
+
+    Args:
+        cache (TTLCache): _FILE_ROW_CACHE or _QUESTION_ROW_CACHE
+        key (int): Primary key of the changed row
+    """
+    with _ROW_CACHE_LOCK:
+        cache.pop(key, None)
+
+def _invalidate_file_ids() -> None:
+    """
+    Drop all cached get_file_id results after a files row is added, edited or deleted
+    Any lookup key may now resolve differently (e.g. "latest"), and the cache is small
+    """
+    with _ROW_CACHE_LOCK:
+        _FILE_ID_CACHE.clear()
+
 def _strip_known_prefixes(p: str) -> str:
     """
     Removes known leading path prefixes from a string
@@ -219,6 +529,32 @@ def _strip_known_prefixes(p: str) -> str:
             return p[len(pref):]
     return p
 
+def _normalize_course(course) -> str:
+    """
+    Normalize a course code to the stored form: trimmed and uppercased, e.g. " st2131 " -> "ST2131"
+
+    Args:
+        course (str): Course code
+
+    Returns:
+        str/None: Normalised course code, or None if course is None
+    """
+    if course is None:
+        return None
+    return str(course).strip().upper()
+
+# Separators collapsed to a single space before alias lookup
+_SEM_SEP_RE = re.compile(r"[-_\s]+")
+_ASSESSMENT_SEP_RE = re.compile(r"[-\s]+")
+
+# Every accepted semester alias -> canonical code
+_SEM_MAP = {
+    **dict.fromkeys(("1", "sem 1", "semester 1", "s1", "sem1"), "S1"),
+    **dict.fromkeys(("2", "sem 2", "semester 2", "s2", "sem2"), "S2"),
+    **dict.fromkeys(("st1", "st 1", "special term 1", "specialterm 1", "special term i", "st i"), "ST1"),
+    **dict.fromkeys(("st2", "st 2", "special term 2", "specialterm 2", "special term ii", "st ii"), "ST2"),
+}
+
 def _normalize_semester(sem: str) -> str:
     """
     Normalize various semester inputs to a compact canonical form
@@ -235,20 +571,9 @@ def _normalize_semester(sem: str) -> str:
     """
     if sem is None:
         return ""
-    s = str(sem).strip().lower().replace("-", " ").replace("_", " ")
-    # Remove duplicate spaces
-    s = " ".join(s.split())
-
-    # Common mappings
-    if s in {"1", "sem 1", "semester 1", "s1", "sem1"}:
-        return "S1"
-    if s in {"2", "sem 2", "semester 2", "s2", "sem2"}:
-        return "S2"
-    if s in {"st1", "st 1", "special term 1", "specialterm 1", "special term i", "st i"}:
-        return "ST1"
-    if s in {"st2", "st 2", "special term 2", "specialterm 2", "special term ii", "st ii"}:
-        return "ST2"
-    return s.upper()
+    # Treat "-", "_" and runs of whitespace as a single space
+    s = _SEM_SEP_RE.sub(" ", str(sem).lower()).strip()
+    return _SEM_MAP.get(s, s.upper())
 
 def _normalize_assessment_type(t: str) -> str:
     """
@@ -265,9 +590,7 @@ def _normalize_assessment_type(t: str) -> str:
     """
     if t is None:
         return ""
-    s = str(t).strip().lower().replace("-", " ")
-    s = " ".join(s.split())
-    return s.lower()
+    return _ASSESSMENT_SEP_RE.sub(" ", str(t).lower()).strip()
 
 def get_file_id(course: str, year, semester: str, assessment_type: str, latest: bool = True):
     """
@@ -296,36 +619,42 @@ def get_file_id(course: str, year, semester: str, assessment_type: str, latest:
     except Exception:
         raise ValueError("year must be an integer-like value")
 
-    course_norm = str(course).strip().upper()
+    # files uses a case-insensitive collation, so plain equality matches regardless of case
+    # and can seek idx_files_lookup (UPPER() around the columns forced a full scan)
+    course_norm = _normalize_course(course)
     sem_norm = _normalize_semester(semester)
     atype_norm = _normalize_assessment_type(assessment_type)
 
+    key = (course_norm, year_int, sem_norm, atype_norm, bool(latest))
+    return _cached_row(_FILE_ID_CACHE, key, _lookup_file_id)
+
+def _lookup_file_id(key: tuple):
+    """
+    Run get_file_id's query for an already-normalised key
+
+    Args:
+        key (tuple): (course, year, semester, assessment_type, latest) as built by get_file_id
+
+    Returns:
+        int/None: Matching files.id else None if no match
+    """
+    course_norm, year_int, sem_norm, atype_norm, latest = key
     sql = """
         SELECT id
         FROM files
-        WHERE UPPER(course) = %s
+        WHERE course = %s
           AND year = %s
-          AND UPPER(semester) = %s
-          AND UPPER(assessment_type) = %s
+          AND semester = %s
+          AND assessment_type = %s
         {order_clause}
         LIMIT 1
     """.format(order_clause="ORDER BY uploaded_at DESC, id DESC" if latest else "")
 
-    params = (course_norm, year_int, sem_norm, atype_norm)
-
     with closing(get_connection()) as conn:
         cur = conn.cursor()
-        cur.execute(sql, params)
+        cur.execute(sql, (course_norm, year_int, sem_norm, atype_norm))
         row = cur.fetchone()
         return int(row[0]) if row else None
-    params = (course, year, semester, assessment_type)
-
-    with closing(get_connection()) as conn:
-        cur = conn.cursor()
-        cur.execute(sql, params)
-        row = cur.fetchone()
-        return int(row[0]) if row else None
-    return
 
 def _safe_join_file(base_dir: str, file_path: str) -> str:
     """
@@ -364,6 +693,7 @@ def normalize_concept_tags(val):
     
     Returns:
         str: JSON string (e.g., '["regression","r-squared"]') or string if JSON array not valid
+            Repeated tags are dropped, keeping first-seen order
             None when input is None
     
     Raises:
@@ -373,19 +703,59 @@ def normalize_concept_tags(val):
     if val is None:
         return None
     if isinstance(val, (list, tuple)):
-        return json.dumps(list(val), ensure_ascii=False)
+        return _dumps(_dedupe_tags(val))
     if isinstance(val, str):
         try:
-            parsed = json.loads(val)
+            parsed = _loads(val)
             if isinstance(parsed, (list, tuple)):
-                return json.dumps(list(parsed), ensure_ascii=False)
+                return _dumps(_dedupe_tags(parsed))
         except Exception:
             pass
         return val
-    return json.dumps(val, ensure_ascii=False)
+    return _dumps(val)
+
+def _dedupe_tags(tags) -> list:
+    """
+    Drop repeated tags while keeping first-seen order (dict.fromkeys runs in C)
+
+    Args:
+        tags (list/tuple): Concept tags
+
+    Returns:
+        list: Tags without duplicates; returned unchanged as a list if any tag is unhashable
+    """
+    try:
+        return list(dict.fromkeys(tags))
+    except TypeError:
+        return list(tags)
+
+def normalize_question_options(options_raw):
+    """
+    Prepare 'question_options' for storage, encoding or decoding it at most once
+    A JSON string from the client is validated and stored as given instead of being
+    decoded and re-encoded; Python lists/dicts are encoded once
+
+    Args:
+        options_raw (list/dict/JSON string/None): question_options from the request body
+
+    Returns:
+        tuple[str, Any]: (JSON text to store, decoded options for the response)
+
+    Raises:
+        ValueError: If options_raw is a string that is not valid JSON
+    """
+    if options_raw is None:
+        return _EMPTY_JSON_ARRAY, []
+    if isinstance(options_raw, str):
+        options_val = _loads(options_raw)
+        return (options_raw if options_val is not None else _EMPTY_JSON_ARRAY), options_val
+    return _dumps(options_raw), options_raw
 
 MODEL_PATH = os.getenv("diff_model_path", "/app/models/model_elasticnet.pkl")
+# Loaded on first use by _get_difficulty_model() so workers that never predict skip pandas/sklearn
 difficulty_model = None
+_model_load_attempted = False
+_model_lock = threading.Lock()
 featurepath = "/app/difficulty_rating_experimentation/model_experimentation 4 features.py"
 
 def _load_training_helpers():
@@ -433,7 +803,7 @@ def parse_tags(val):
     if isinstance(val, (list, tuple)):
         return list(val)
     try:
-        return json.loads(val) or []
+        return _loads(val) or []
     except Exception:
         return []
 
@@ -454,15 +824,46 @@ def predict_row(row: dict) -> float:
     Raises:
         None
     """
-    stem = (row.get("question_stem") or "").strip()
-    tags_text = " ".join(parse_tags(row.get("concept_tags")))
-    X = pd.DataFrame([{
-        "question_stem": stem,
-        "tags_text": tags_text,
-        "question_type": row.get("question_type") or "",
-    }])
-    yhat = float(difficulty_model.predict(X)[0])
-    return float(np.clip(yhat, 0.0, 1.0))
+    return predict_rows([row])[0]
+
+# Predictions by (question_stem, tags_text, question_type); the model is loaded once per
+# process and is deterministic, so unchanged questions never need the pipeline again
+_PREDICTION_CACHE = LRUCache(maxsize=int(os.getenv("PREDICTION_CACHE_SIZE", "4096")))
+_PREDICTION_CACHE_LOCK = threading.Lock()
+
+def predict_rows(rows: list) -> list:
+    """
+    Predicts difficulty ratings for many rows with a single model call, so the pipeline's
+    vectorisers and transformers run once per batch instead of once per row
+    Rows whose inputs were predicted before are answered from _PREDICTION_CACHE
+
+    Args:
+        rows (list[dict]): Rows with "question_stem", "concept_tags" and "question_type"
+
+    Returns:
+        list[float]: Predicted ratings clipped to [0, 1], in the order of rows
+    """
+    keys = [(
+        (row.get("question_stem") or "").strip(),
+        " ".join(parse_tags(row.get("concept_tags"))),
+        row.get("question_type") or "",
+    ) for row in rows]
+
+    with _PREDICTION_CACHE_LOCK:
+        cached = {k: _PREDICTION_CACHE[k] for k in keys if k in _PREDICTION_CACHE}
+    misses = list(dict.fromkeys(k for k in keys if k not in cached))
+
+    if misses:
+        import pandas as pd
+        import numpy as np
+
+        X = pd.DataFrame(misses, columns=["question_stem", "tags_text", "question_type"])
+        yhats = np.clip(np.asarray(_get_difficulty_model().predict(X), dtype=float), 0.0, 1.0).tolist()
+        cached.update(zip(misses, yhats))
+        with _PREDICTION_CACHE_LOCK:
+            _PREDICTION_CACHE.update(zip(misses, yhats))
+
+    return [cached[k] for k in keys]
 
 def _get_question_row(question_id: int):
     """
@@ -490,6 +891,18 @@ def _get_question_row(question_id: int):
         cur.execute("SELECT id, page_image_paths FROM questions WHERE id=%s", (question_id,))
         return cur.fetchone()
 
+def _get_question_row_cached(question_id: int):
+    """
+    Same as _get_question_row, served from the short-lived question row cache when possible
+
+    Args:
+        question_id (int): questions.id of the desired question
+
+    Returns:
+        dict/None: {"id", "page_image_paths"}, or None if no such question
+    """
+    return _cached_row(_QUESTION_ROW_CACHE, question_id, _get_question_row)
+
 def _safe_join_media(base_dir: str, file_path: str) -> str:
     """
     description: Safely joins a base directory path with a potentially relative media file path. 
@@ -535,243 +948,728 @@ def health():
     Returns:
         tuple[dict, int]: JSON containing:
             - "ok" (bool): Always True if the app is running.
-            - "model_loaded" (bool): Whether the difficulty model was successfully loaded at startup.
+            - "model_loaded" (bool): Whether the difficulty model has been loaded
+              (it is loaded lazily by the first /predict_difficulty call).
         and HTTP 200.
     """
     return {"ok": True, "model_loaded": difficulty_model is not None}, 200
 
 # ---- Main Query Route ----
-@app.route("/getquestion", methods=["GET"])
-def get_question():
-    """
-    Fetch questions with their source file metadata from the database, with filters and pagination
+# SELECT columns shared by /getquestion
+_GET_QUESTION_COLS = (
+    "q.id", "q.question_base_id", "q.version_id", "q.file_id", "q.question_no",
+    "q.question_type", "q.question_stem", "q.question_stem_html",
+    "q.concept_tags", "q.page_image_paths",
+    "q.last_used", "q.created_at", "q.updated_at",
+    "q.question_options", "q.question_answer",
+    "q.difficulty_rating_manual", "q.difficulty_rating_model",
+    "f.course", "f.year", "f.semester", "f.assessment_type", "f.file_name", "f.file_path"
+)
+
+# Optional /getquestion filters and their WHERE predicates, in a fixed order
+# so every combination of active filters maps to exactly one SQL text
+_GET_QUESTION_FILTERS = (
+    ("course", "f.course = %s"),
+    ("year", "f.year = %s"),
+    ("semester", "f.semester = %s"),
+    ("assessment_type", "f.assessment_type = %s"),
+    ("question_type", "q.question_type = %s"),
+    ("question_no", "q.question_no = %s"),
+    # AND-of-tags via the question_concept_tags mapping table; {tags} is one %s per tag,
+    # the trailing %s is the number of distinct tags (tag is part of the PK, so COUNT(*) is distinct)
+    ("concept_tags", """q.id IN (
+            SELECT qct.question_id
+            FROM question_concept_tags qct
+            WHERE qct.tag IN ({tags})
+            GROUP BY qct.question_id
+            HAVING COUNT(*) = %s
+        )"""),
+)
+_GET_QUESTION_PREDICATES = dict(_GET_QUESTION_FILTERS)
+
+@functools.lru_cache(maxsize=128)
+def _build_get_question_sql(active_filters: tuple, order_by_sql: str, sort_sql: str, n_tags: int = 0,
+                            fields: tuple = None, keyset: bool = False) -> str:
+    """
+    Build the /getquestion SQL once per filter shape and cache it
 
-    Supported query parameters (All Optional):
-        - course (str): Filter by files.course
-        - year (int): Filter by files.year
-        - semester (str): Filter by files.semester
-        - assessment_type (str): Filter by files.assessment_type
-        - question_type (str): Filter by questions.question_type
-        - question_no (str/int): Filter by questions.question_no
-        - concept_tags (repeated or comma-separated): e.g.
-              ?concept_tags=regression&concept_tags=anova
-              ?concept_tags=regression,anova
-          Matched via JSON_CONTAINS on questions.concept_tags.
-        - limit (int, default=50): Max number of rows to return
-        - offset (int, default=0): Offset for pagination
-        - order_by (str, default="updated_at"): One of {"created_at","difficulty","updated_at"}
-        - sort (str, default="desc"): "asc" or "desc"
+    Args:
+        active_filters (tuple[str]): Names of the filters present in the request,
+            in _GET_QUESTION_FILTERS order
+        order_by_sql (str): Whitelisted ORDER BY column
+        sort_sql (str): "ASC" or "DESC"
+        n_tags (int): Number of distinct concept tags when the concept_tags filter is active
+        fields (tuple[str], optional): Item fields to select (keys of _GET_QUESTION_FIELDS);
+            all of _GET_QUESTION_COLS when None
+        keyset (bool): Only return rows after a (sort value, id) cursor, for ?cursor=...
 
     Returns:
-        flask.Response (application/json):
-            {
-              "total": <int>,
-              "items": [
-                 {
-                   "id": ...,
-                   "question_stem": ...,
-                   "concept_tags": [...],
-                   ...
-                   "course": ...,
-                   "year": ...,
-                   ...
-                 },
-                 ...
-              ]
-            }
-        with HTTP 200.
+        str: Parameterised SQL with %s placeholders for the active filters, then the cursor's
+            sort value and id when keyset is set, followed by LIMIT and OFFSET.
+            The sort column and q.id are selected last so the page can report its next cursor.
+    """
+    where_sql = _get_question_where_sql(active_filters, n_tags)
+    if keyset:
+        op = ">" if sort_sql == "ASC" else "<"
+        where_sql += (" AND " if where_sql else "WHERE ") + f"({order_by_sql}, q.id) {op} (%s, %s)"
+    cols = _GET_QUESTION_COLS if fields is None else [_GET_QUESTION_FIELDS[name][0] for name in fields]
+    # q.id breaks ties, so pages never overlap or skip rows with an equal sort value
+    return f"""
+        SELECT {", ".join(cols)}, {order_by_sql}, q.id
+        FROM questions q
+        JOIN files f ON f.id = q.file_id
+        {where_sql}
+        ORDER BY {order_by_sql} {sort_sql}, q.id {sort_sql}
+        LIMIT %s OFFSET %s
     """
-    # Allowed Query Parameters
-    course = request.args.get("course")
-    year = request.args.get("year")
-    semester = request.args.get("semester")
-    assessment_type = request.args.get("assessment_type")
-
-    question_type = request.args.get("question_type")
-    question_no = request.args.get("question_no")
-
-    # Concept Tags supports both:
-        # ?concept_tags=a&concept_tags=b
-        # ?concept_tags=a,b
-    # Normalize into one list
-    raw_tags = request.args.getlist("concept_tags")
-    concept_tags = []
-    for t in raw_tags:
-        concept_tags.extend([s.strip() for s in t.split(",") if s.strip()])
 
-    # Default Pagination and Sorting
-    limit = int(request.args.get("limit", 100000))
-    offset = int(request.args.get("offset", 0))
-    order_by_arg = (request.args.get("order_by") or "").lower()
-    sort_arg = (request.args.get("sort") or "desc").lower()
+def _get_question_where_sql(active_filters: tuple, n_tags: int) -> str:
+    """
+    Build the WHERE clause for a /getquestion filter shape
 
-    # Whitelist order_by to prevent SQL injection
-    # Future Improvement: Flexibility of order_by_args
-    if order_by_arg == "created_at":
-        order_by_sql = "q.created_at"
-    elif order_by_arg == "difficulty":
-        order_by_sql = "q.difficulty_rating_model"
-    else:
-        order_by_sql = "q.updated_at"
-    sort_sql = "ASC" if sort_arg == "asc" else "DESC"
+    Args:
+        active_filters (tuple[str]): Names of the active filters, in _GET_QUESTION_FILTERS order
+        n_tags (int): Number of distinct concept tags when the concept_tags filter is active
 
-    # SELECT columns 
-    select_cols = [
-        "q.id", "q.question_base_id", "q.version_id", "q.file_id", "q.question_no",
-        "q.question_type", "q.question_stem", "q.question_stem_html",
-        "q.concept_tags", "q.page_image_paths", 
-        "q.last_used", "q.created_at", "q.updated_at",
-        "q.question_options", "q.question_answer",
-        "q.difficulty_rating_manual", "q.difficulty_rating_model",
-        "f.course", "f.year", "f.semester", "f.assessment_type", "f.file_name", "f.file_path"
+    Returns:
+        str: "WHERE ..." with %s placeholders, or "" if no filter is active
+    """
+    where_clauses = [
+        _GET_QUESTION_PREDICATES[name].format(tags=", ".join(["%s"] * n_tags))
+        if name == "concept_tags" else _GET_QUESTION_PREDICATES[name]
+        for name in active_filters
     ]
+    return ("WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
 
-    # Build WHERE with parameters
-    where_clauses = []
-    params = []
-
-    # File table filters
-    if course:
-        where_clauses.append("f.course = %s")
-        params.append(course)
-    if year:
-        where_clauses.append("f.year = %s")
-        params.append(year)
-    if semester:
-        where_clauses.append("f.semester = %s")
-        params.append(semester)
-    if assessment_type:
-        where_clauses.append("f.assessment_type = %s")
-        params.append(assessment_type)
-
-    # Question table filters
-    if question_type:
-        where_clauses.append("q.question_type = %s")
-        params.append(question_type)
-    if question_no:
-        where_clauses.append("q.question_no = %s")
-        params.append(question_no)
-
-    if concept_tags:
-        where_clauses.append("JSON_CONTAINS(q.concept_tags, CAST(%s AS JSON))")
-        params.append(json.dumps(concept_tags))
+@functools.lru_cache(maxsize=128)
+def _build_get_question_count_sql(active_filters: tuple, n_tags: int = 0) -> str:
+    """
+    Build the COUNT(*) twin of the /getquestion SQL (same FROM/WHERE, no ORDER BY/LIMIT)
 
-    where_sql = ("WHERE " + " AND ".join(where_clauses)) if where_clauses else ""
+    Args:
+        active_filters (tuple[str]): Names of the active filters, in _GET_QUESTION_FILTERS order
+        n_tags (int): Number of distinct concept tags when the concept_tags filter is active
 
-    sql = f"""
-        SELECT {", ".join(select_cols)}
+    Returns:
+        str: Parameterised COUNT(*) SQL
+    """
+    return f"""
+        SELECT COUNT(*)
         FROM questions q
         JOIN files f ON f.id = q.file_id
-        {where_sql}
-        ORDER BY {order_by_sql} {sort_sql}
-        LIMIT %s OFFSET %s
+        {_get_question_where_sql(active_filters, n_tags)}
     """
-    params.extend([limit, offset])
 
-    # Execute Query
-    with closing(get_connection()) as conn, closing(conn.cursor()) as cur:
-        cur.execute(sql, params)
-        rows = cur.fetchall()
+# Filtered totals for /getquestion, shared by the pages of one listing
+_GET_QUESTION_COUNT_CACHE = TTLCache(maxsize=256, ttl=int(os.getenv("GETQUESTION_COUNT_TTL", "30")))
+_GET_QUESTION_COUNT_LOCK = threading.Lock()
 
-    # Map to dicts
-    items = []
-    for row in rows:
-        (
-            q_id, q_base_id, q_version_id, file_id, q_no,
-            q_type, stem, stem_html,
-            concept_json, media_json, last_used, created_at, updated_at,
-            options_json, answer_json,
-            difficulty_manual, difficulty_model,
-            f_course, f_year, f_semester, f_assessment, f_name, f_path
-        ) = row
-        
-        # Normalize JSON fields
-        concept_list = parse_json_field(concept_json)
-        media_list = parse_json_field(media_json)
-        options_list = parse_json_field(options_json)
-        answer_data = parse_json_field(answer_json)
-
-        difficulty_level = difficulty_manual if difficulty_manual is not None else difficulty_model
-
-        items.append({
-            "id": q_id,
-            "question_base_id": q_base_id,
-            "version_id": q_version_id,
-            "file_id": file_id,
-            "question_no": q_no,
-            "question_type": q_type,
-            "question_stem": stem,
-            "question_stem_html": stem_html,
-            "concept_tags": concept_list,
-            "question_media": media_list,
-            "question_options": options_list,
-            "question_answer": answer_data,
-            "last_used": ts(last_used),
-            "created_at": ts(created_at),
-            "updated_at": ts(updated_at),
-
-            "difficulty_manual": difficulty_manual,
-            "difficulty_model": difficulty_model,
-            "difficulty_level": difficulty_level,
-
-            "course": f_course,
-            "year": f_year,
-            "semester": f_semester,
-            "assessment_type": f_assessment,
-            "file_name": f_name,
-            "file_path": f_path,
-        })
+# Serialised /getquestion bodies by query, bounded by total size. Off by default: writes only
+# clear this worker's copy, so other workers may serve a body up to GETQUESTION_CACHE_TTL old
+GETQUESTION_CACHE_TTL = float(os.getenv("GETQUESTION_CACHE_TTL", "0"))
+_GET_QUESTION_RESPONSE_CACHE = TTLCache(
+    maxsize=int(os.getenv("GETQUESTION_CACHE_MB", "64")) * 1024 * 1024,
+    ttl=GETQUESTION_CACHE_TTL or 1,
+    getsizeof=len,
+)
 
-    return jsonify({"total": len(items), "items": items})
+def _invalidate_get_question_caches() -> None:
+    """
+    Drop this worker's cached /getquestion bodies and totals after questions or files change
+    """
+    with _GET_QUESTION_COUNT_LOCK:
+        _GET_QUESTION_COUNT_CACHE.clear()
+        _GET_QUESTION_RESPONSE_CACHE.clear()
 
-# ---- Download Route ----
-file_base_directory = os.getenv("file_base_directory", "/app/data/source_files")
-question_media_base_directory = os.getenv("question_media_base_directory", "/app/data/question_media")
+def _count_filtered_questions(cur, active_filters: tuple, n_tags: int, filter_params: list) -> int:
+    """
+    Count the questions matching a /getquestion filter, cached for a short TTL
+    so paging through one result set runs the COUNT once
 
-@app.route("/files/<int:file_id>/download", methods=["GET"])
-def download_file(file_id: int):
+    Args:
+        cur (MySQLdb cursor): Open cursor to run the COUNT on a cache miss
+        active_filters (tuple[str]): Names of the active filters, in _GET_QUESTION_FILTERS order
+        n_tags (int): Number of distinct concept tags when the concept_tags filter is active
+        filter_params (list): Values for the WHERE placeholders (no LIMIT/OFFSET)
+
+    Returns:
+        int: Number of matching questions
     """
-    description: Retrieves file metadata from the database using a file ID, constructs the safe 
-                 filesystem path, verifies file existence, determines the MIME type, and streams 
-                 the file back to the client as an attachment.
+    key = (active_filters, tuple(filter_params))
+    with _GET_QUESTION_COUNT_LOCK:
+        total = _GET_QUESTION_COUNT_CACHE.get(key)
+    if total is not None:
+        return total
 
-    args:
-        file_id (int): The unique database identifier for the file being requested.
+    cur.execute(_build_get_question_count_sql(active_filters, n_tags), filter_params)
+    total = int(cur.fetchone()[0])
+    with _GET_QUESTION_COUNT_LOCK:
+        _GET_QUESTION_COUNT_CACHE[key] = total
+    return total
 
-    returns:
-        flask.Response: A Flask response object containing the file data, headers configured 
-                        for download (Content-Disposition), and the appropriate MIME type.
+def _json_column(value):
+    """
+    Prepare a MySQL JSON-typed column for a response item without decoding it when possible
+    MySQL only stores valid JSON there, so with orjson the text is embedded as-is (orjson.Fragment);
+    otherwise it is parsed like parse_json_field
 
-    raises:
-        HTTPException (404 Not Found): 
-            If the file_id does not exist in the database.
+    Args:
+        value (str/bytes/None): Raw column value
+
+    Returns:
+        orjson.Fragment/Any: Value to place in the item (only for serialising with _encode_json)
+    """
+    if not value:
+        return None
+    if _JSON_FRAGMENT is not None:
+        return _JSON_FRAGMENT(value)
+    return parse_json_field(value)
+
+def _get_question_item(row: tuple) -> dict:
+    """
+    Map one /getquestion row (_GET_QUESTION_COLS order) to its response item
+
+    Args:
+        row (tuple): Row from the /getquestion SELECT
+
+    Returns:
+        dict: Question fields with JSON columns decoded (or as orjson fragments), plus its file metadata
+    """
+    (
+        q_id, q_base_id, q_version_id, file_id, q_no,
+        q_type, stem, stem_html,
+        concept_json, media_json, last_used, created_at, updated_at,
+        options_json, answer_json,
+        difficulty_manual, difficulty_model,
+        f_course, f_year, f_semester, f_assessment, f_name, f_path,
+        *_  # trailing sort value and id, see _build_get_question_sql
+    ) = row
+    
+    # Normalize JSON fields (question_answer is LONGTEXT and may not be JSON, so it is always parsed)
+    concept_list = _json_column(concept_json)
+    media_list = _json_column(media_json)
+    options_list = _json_column(options_json)
+    answer_data = parse_json_field(answer_json)
+
+    difficulty_level = difficulty_manual if difficulty_manual is not None else difficulty_model
+
+    return {
+        "id": q_id,
+        "question_base_id": q_base_id,
+        "version_id": q_version_id,
+        "file_id": file_id,
+        "question_no": q_no,
+        "question_type": q_type,
+        "question_stem": stem,
+        "question_stem_html": stem_html,
+        "concept_tags": concept_list,
+        "question_media": media_list,
+        "question_options": options_list,
+        "question_answer": answer_data,
+        "last_used": last_used,
+        "created_at": created_at,
+        "updated_at": updated_at,
+
+        "difficulty_manual": difficulty_manual,
+        "difficulty_model": difficulty_model,
+        "difficulty_level": difficulty_level,
+
+        "course": f_course,
+        "year": f_year,
+        "semester": f_semester,
+        "assessment_type": f_assessment,
+        "file_name": f_name,
+        "file_path": f_path,
+    }
+
+# Item fields that /getquestion?fields=... can select: name -> (SELECT expression, value converter)
+# concept_tags_count is computed by MySQL and only returned when asked for
+_GET_QUESTION_FIELDS = {
+    "id": ("q.id", None),
+    "question_base_id": ("q.question_base_id", None),
+    "version_id": ("q.version_id", None),
+    "file_id": ("q.file_id", None),
+    "question_no": ("q.question_no", None),
+    "question_type": ("q.question_type", None),
+    "question_stem": ("q.question_stem", None),
+    "question_stem_html": ("q.question_stem_html", None),
+    "concept_tags": ("q.concept_tags", _json_column),
+    "concept_tags_count": ("COALESCE(JSON_LENGTH(q.concept_tags), 0)", None),
+    "question_media": ("q.page_image_paths", _json_column),
+    "question_options": ("q.question_options", _json_column),
+    "question_answer": ("q.question_answer", parse_json_field),
+    "last_used": ("q.last_used", None),
+    "created_at": ("q.created_at", None),
+    "updated_at": ("q.updated_at", None),
+    "difficulty_manual": ("q.difficulty_rating_manual", None),
+    "difficulty_model": ("q.difficulty_rating_model", None),
+    "difficulty_level": ("COALESCE(q.difficulty_rating_manual, q.difficulty_rating_model)", None),
+    "course": ("f.course", None),
+    "year": ("f.year", None),
+    "semester": ("f.semester", None),
+    "assessment_type": ("f.assessment_type", None),
+    "file_name": ("f.file_name", None),
+    "file_path": ("f.file_path", None),
+}
+
+@functools.lru_cache(maxsize=64)
+def _get_question_item_mapper(fields: tuple = None):
+    """
+    Return the row -> item function for a /getquestion projection
+
+    Args:
+        fields (tuple[str], optional): Selected field names, or None for the full item
+
+    Returns:
+        callable: Maps one row of the matching SELECT to its response item
+    """
+    if fields is None:
+        return _get_question_item
+    specs = [(name, _GET_QUESTION_FIELDS[name][1]) for name in fields]
+    # zip stops at the last field, leaving out the trailing sort value and id
+    return lambda row: {name: (conv(v) if conv else v) for (name, conv), v in zip(specs, row)}
+
+def _next_cursor(query: dict, rows: list):
+    """
+    Build the ?cursor= value that continues after a /getquestion page
+
+    Args:
+        query (dict): Output of _get_question_query
+        rows (list[tuple]): The page's rows, ending in (sort value, id)
+
+    Returns:
+        str/None: "<sort value>_<id>", or None if the page was not full (no more rows)
+            or cannot be continued by cursor (difficulty order, NULL sort value)
+    """
+    if len(rows) < query["limit"] or not query["cursor_ok"]:
+        return None
+    sort_value, q_id = rows[-1][-2:]
+    if sort_value is None:
+        return None
+    return f"{ts(sort_value)}_{q_id}"
+
+def _parse_cursor(cursor: str) -> list:
+    """
+    Parse a /getquestion ?cursor= value
+
+    Args:
+        cursor (str): "<ISO 8601 timestamp>_<question id>", as returned in next_cursor
+
+    Returns:
+        list: [datetime, int] parameters for the keyset predicate
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    value, sep, q_id = cursor.rpartition("_")
+    if not sep:
+        raise ValueError("cursor must look like <timestamp>_<id>")
+    return [datetime.datetime.fromisoformat(value), int(q_id)]
+
+# Rows fetched per round trip when /getquestion streams
+GETQUESTION_STREAM_BATCH = int(os.getenv("GETQUESTION_STREAM_BATCH", "500"))
+
+def _stream_get_question(query: dict):
+    """
+    Generate the /getquestion?stream=1 body batch by batch from a server-side cursor,
+    so memory stays bounded by GETQUESTION_STREAM_BATCH rows instead of the whole result
+
+    Args:
+        query (dict): Output of _get_question_query
+
+    Yields:
+        bytes/str: Pieces of {"items": [...], "total": <int>, "total_filtered": <int>, "next_cursor": <str/None>}
+    """
+    limit, offset, params = query["limit"], query["offset"], query["params"]
+    last_rows = []
+    to_item = _get_question_item_mapper(query["fields"])
+    with closing(get_connection()) as conn:
+        n = 0
+        yield '{"items":['
+        # SSCursor leaves rows on the server until fetched; it must be drained before the COUNT below
+        with closing(conn.cursor(SSCursor)) as cur:
+            cur.execute(query["sql"], params + query["keyset_params"] + [limit, offset])
+            while True:
+                rows = cur.fetchmany(GETQUESTION_STREAM_BATCH)
+                if not rows:
+                    break
+                last_rows = rows
+                chunk = _encode_json([to_item(row) for row in rows])
+                # splice the batch's array contents into the open items array
+                yield ("," if n else "") + (chunk.decode() if isinstance(chunk, bytes) else chunk)[1:-1]
+                n += len(rows)
+
+        if offset == 0 and not query["keyset_params"] and n < limit:
+            total_filtered = n
+        else:
+            with closing(conn.cursor()) as cur:
+                total_filtered = _count_filtered_questions(cur, query["active_filters"], query["n_tags"], params)
+        next_cursor = _next_cursor(query, last_rows) if n == limit else None
+        yield f'],"total":{n},"total_filtered":{total_filtered},"next_cursor":{_dumps(next_cursor)}}}'
+
+def _get_question_query(args) -> dict:
+    """
+    Turn /getquestion arguments into the SQL and parameters to run
+    Shared by /getquestion (query string) and /getquestion:batch (one dict per query)
+
+    Args:
+        args (werkzeug.datastructures.MultiDict): Query arguments, as documented on get_question
+
+    Returns:
+        dict: sql, fields (projection or None), params (filter values, without LIMIT/OFFSET),
+            keyset_params (cursor values, empty without ?cursor=), cursor_ok (order supports
+            cursors), limit, offset, active_filters and n_tags (number of distinct concept tags)
+
+    Raises:
+        ValueError: If limit or offset is not an integer, fields names an unknown field,
+            or cursor is malformed or used with order_by=difficulty
+    """
+    # Allowed Query Parameters
+    course = args.get("course")
+    year = args.get("year")
+    semester = args.get("semester")
+    assessment_type = args.get("assessment_type")
+
+    question_type = args.get("question_type")
+    question_no = args.get("question_no")
+
+    # Concept Tags supports both:
+        # ?concept_tags=a&concept_tags=b
+        # ?concept_tags=a,b
+    # Normalize into one de-duplicated list
+    raw_tags = args.getlist("concept_tags")
+    concept_tags = list(dict.fromkeys(
+        s for t in raw_tags for s in map(str.strip, t.split(",")) if s
+    ))
+
+    # Default Pagination and Sorting
+    limit = int(args.get("limit", 100000))
+    offset = int(args.get("offset", 0))
+    order_by_arg = (args.get("order_by") or "").lower()
+    sort_arg = (args.get("sort") or "desc").lower()
+
+    # Whitelist order_by to prevent SQL injection
+    # Future Improvement: Flexibility of order_by_args
+    if order_by_arg == "created_at":
+        order_by_sql = "q.created_at"
+    elif order_by_arg == "difficulty":
+        order_by_sql = "q.difficulty_rating_model"
+    else:
+        order_by_sql = "q.updated_at"
+    sort_sql = "ASC" if sort_arg == "asc" else "DESC"
+
+    # Build WHERE with parameters
+    # File table filters, then question table filters (same order as _GET_QUESTION_FILTERS)
+    filter_values = {
+        "course": course,
+        "year": year,
+        "semester": semester,
+        "assessment_type": assessment_type,
+        "question_type": question_type,
+        "question_no": question_no,
+        "concept_tags": concept_tags,
+    }
+    active_filters = tuple(name for name, _ in _GET_QUESTION_FILTERS if filter_values[name])
+    params = []
+    for name in active_filters:
+        if name == "concept_tags":
+            params.extend(concept_tags)
+            params.append(len(concept_tags))
+        else:
+            params.append(filter_values[name])
+
+    # Optional projection: ?fields=id,question_stem,concept_tags_count
+    fields = None
+    raw_fields = [f for v in args.getlist("fields") for f in map(str.strip, v.split(",")) if f]
+    if raw_fields:
+        unknown = [f for f in raw_fields if f not in _GET_QUESTION_FIELDS]
+        if unknown:
+            raise ValueError(f"unknown field: {unknown[0]}")
+        fields = tuple(dict.fromkeys(raw_fields))
+
+    # Optional keyset pagination: ?cursor=<next_cursor of the previous page> replaces offset
+    cursor_ok = order_by_sql != "q.difficulty_rating_model"
+    cursor = args.get("cursor")
+    keyset_params = []
+    if cursor:
+        if not cursor_ok:
+            raise ValueError("cursor is not supported with order_by=difficulty")
+        keyset_params = _parse_cursor(cursor)
+        offset = 0
+
+    sql = _build_get_question_sql(active_filters, order_by_sql, sort_sql, len(concept_tags), fields,
+                                  bool(keyset_params))
+
+    return {
+        "sql": sql,
+        "fields": fields,
+        "params": params,
+        "keyset_params": keyset_params,
+        "cursor_ok": cursor_ok,
+        "limit": limit,
+        "offset": offset,
+        "active_filters": active_filters,
+        "n_tags": len(concept_tags),
+    }
+
+def _run_get_question_query(cur, query: dict) -> dict:
+    """
+    Run one parsed /getquestion query
+
+    Args:
+        cur (MySQLdb cursor): Open cursor
+        query (dict): Output of _get_question_query
+
+    Returns:
+        dict: {"total": <items in this page>, "total_filtered": <matching questions>,
+            "next_cursor": <str/None>, "items": [...]}
+    """
+    limit, offset = query["limit"], query["offset"]
+    cur.execute(query["sql"], query["params"] + query["keyset_params"] + [limit, offset])
+    rows = cur.fetchall()
+
+    # A first page that is not full already holds every match
+    if offset == 0 and not query["keyset_params"] and len(rows) < limit:
+        total_filtered = len(rows)
+    else:
+        total_filtered = _count_filtered_questions(cur, query["active_filters"], query["n_tags"], query["params"])
+
+    to_item = _get_question_item_mapper(query["fields"])
+    items = [to_item(row) for row in rows]
+    return {"total": len(items), "total_filtered": total_filtered,
+            "next_cursor": _next_cursor(query, rows), "items": items}
+
+@app.route("/getquestion", methods=["GET"])
+def get_question():
+    """
+    Fetch questions with their source file metadata from the database, with filters and pagination
+
+    Supported query parameters (All Optional):
+        - course (str): Filter by files.course
+        - year (int): Filter by files.year
+        - semester (str): Filter by files.semester
+        - assessment_type (str): Filter by files.assessment_type
+        - question_type (str): Filter by questions.question_type
+        - question_no (str/int): Filter by questions.question_no
+        - concept_tags (repeated or comma-separated): e.g.
+              ?concept_tags=regression&concept_tags=anova
+              ?concept_tags=regression,anova
+          A question must carry every listed tag (exact match), looked up in question_concept_tags.
+        - limit (int, default=100000): Max number of rows to return
+        - offset (int, default=0): Offset for pagination
+        - cursor (str, optional): next_cursor of the previous page; continues after its last row
+          with an indexed keyset seek instead of OFFSET (offset is ignored). Not available with
+          order_by=difficulty
+        - order_by (str, default="updated_at"): One of {"created_at","difficulty","updated_at"}
+        - sort (str, default="desc"): "asc" or "desc"
+        - stream (int, default=0): If stream=1, rows are read with a server-side cursor and the
+          body is streamed as they arrive (same JSON; "items" comes first, the totals last)
+        - fields (comma-separated, optional): Only select and return these item fields, e.g.
+              ?fields=id,question_stem,concept_tags_count
+          concept_tags_count (number of tags, computed by MySQL) is only available this way
+
+    Returns:
+        flask.Response (application/json):
+            {
+              "total": <int>,           # number of items in this page
+              "total_filtered": <int>,  # number of questions matching the filters
+              "next_cursor": <str/None>,  # ?cursor= value for the next page, None on the last page
+              "items": [
+                 {
+                   "id": ...,
+                   "question_stem": ...,
+                   "concept_tags": [...],
+                   ...
+                   "course": ...,
+                   "year": ...,
+                   ...
+                 },
+                 ...
+              ]
+            }
+        with HTTP 200, or 400 with {"error": "invalid_query", "message": "..."} for a bad limit/offset/fields/cursor value.
+    """
+    try:
+        query = _get_question_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": "invalid_query", "message": str(e)}), 400
+
+    if request.args.get("stream", default=0, type=int) == 1:
+        return Response(_stream_get_question(query), mimetype="application/json")
+
+    key = None
+    if GETQUESTION_CACHE_TTL > 0:
+        key = (query["sql"], tuple(query["params"]), tuple(query["keyset_params"]),
+               query["limit"], query["offset"])
+        with _GET_QUESTION_COUNT_LOCK:
+            body = _GET_QUESTION_RESPONSE_CACHE.get(key)
+        if body is not None:
+            return Response(body, mimetype="application/json")
+
+    with closing(get_connection()) as conn, closing(conn.cursor()) as cur:
+        result = _run_get_question_query(cur, query)
+
+    # datetimes are serialised to ISO 8601 by _encode_json
+    body = _encode_json(result)
+    if key is not None:
+        with _GET_QUESTION_COUNT_LOCK:
+            try:
+                _GET_QUESTION_RESPONSE_CACHE[key] = body
+            except ValueError:
+                pass  # larger than the whole cache
+    return Response(body, mimetype="application/json")
+
+# Max number of queries in one /getquestion:batch request
+GETQUESTION_BATCH_MAX = int(os.getenv("GETQUESTION_BATCH_MAX", "20"))
+
+@app.post("/getquestion:batch")
+def get_question_batch():
+    """
+    Run several /getquestion queries in one request, on one connection and one read snapshot
+
+    Args:
+        JSON body (dict):
+            - queries (list[dict]): /getquestion query arguments, one dict per query
+              (concept_tags may be a list or a comma-separated string; stream is ignored)
+
+    Returns:
+        flask.Response (application/json):
+            200 with {"results": [{"total", "total_filtered", "items"}, ...]} in request order
+            400 with {"error": "missing_field", "field": "queries"} if queries is missing or empty,
+                {"error": "too_many_queries", "max": <int>} above GETQUESTION_BATCH_MAX,
+                or {"error": "invalid_query", "index": <int>} for a malformed query
+    """
+    payload = request.get_json(silent=True) or {}
+    queries = payload.get("queries")
+    if not isinstance(queries, list) or not queries:
+        return jsonify({"error": "missing_field", "field": "queries"}), 400
+    if len(queries) > GETQUESTION_BATCH_MAX:
+        return jsonify({"error": "too_many_queries", "max": GETQUESTION_BATCH_MAX}), 400
+
+    parsed = []
+    for i, q in enumerate(queries):
+        if not isinstance(q, dict):
+            return jsonify({"error": "invalid_query", "index": i}), 400
+        try:
+            # MultiDict turns list values (e.g. concept_tags) into repeated arguments
+            parsed.append(_get_question_query(MultiDict({k: v for k, v in q.items() if v is not None})))
+        except (ValueError, TypeError, AttributeError):
+            return jsonify({"error": "invalid_query", "index": i}), 400
+
+    # autocommit is off, so every query reads from the same snapshot
+    with closing(get_connection()) as conn, closing(conn.cursor()) as cur:
+        results = [_run_get_question_query(cur, query) for query in parsed]
+
+    return _json_response({"results": results})
+
+# ---- Download Route ----
+file_base_directory = os.getenv("file_base_directory", "/app/data/source_files")
+question_media_base_directory = os.getenv("question_media_base_directory", "/app/data/question_media")
+
+# Hand file bytes to the front server instead of copying them through Python
+#   X_ACCEL_REDIRECT_PREFIX: nginx internal location mapped to the base directories,
+#                            e.g. "/protected/" (files under <prefix>files/, images under <prefix>media/)
+#   USE_X_SENDFILE=1:        Apache/lighttpd style X-Sendfile with the absolute path
+X_ACCEL_REDIRECT_PREFIX = os.getenv("X_ACCEL_REDIRECT_PREFIX", "").rstrip("/")
+app.use_x_sendfile = os.getenv("USE_X_SENDFILE", "0") == "1"
+# Browser cache lifetime of downloads, in seconds. Stored files are never overwritten (a taken
+# name gets a hash suffix), so they can be reused until then; "private" keeps shared caches out
+DOWNLOAD_MAX_AGE = int(os.getenv("DOWNLOAD_MAX_AGE", "86400"))
+
+def _send_download(full_path: str, base_dir: str, accel_location: str, mimetype: str, download_name: str):
+    """
+    Build the download response for a file that has already been resolved safely under base_dir
+
+    With X_ACCEL_REDIRECT_PREFIX set, only headers are returned and nginx serves the body
+    (sendfile, range requests and caching included). Otherwise Flask's send_file is used,
+    which also honours app.use_x_sendfile.
+
+    Args:
+        full_path (str): Absolute path of the file
+        base_dir (str): Base directory the file was resolved under
+        accel_location (str): Sub-location of X_ACCEL_REDIRECT_PREFIX mapped to base_dir
+        mimetype (str): Content-Type of the response
+        download_name (str): Filename for Content-Disposition
+
+    Returns:
+        flask.Response: Download response with Accept-Ranges: bytes and a private
+            Cache-Control of DOWNLOAD_MAX_AGE seconds
+    """
+    if X_ACCEL_REDIRECT_PREFIX:
+        rel_path = os.path.relpath(full_path, os.path.normpath(base_dir))
+        resp = Response(status=200, mimetype=mimetype)
+        resp.headers["X-Accel-Redirect"] = quote(f"{X_ACCEL_REDIRECT_PREFIX}/{accel_location}/{rel_path}")
+        try:
+            download_name.encode("ascii")
+            resp.headers.set("Content-Disposition", "attachment", filename=download_name)
+        except UnicodeEncodeError:
+            # Same fallback as werkzeug's send_file: ASCII filename plus RFC 5987 filename*
+            simple = unicodedata.normalize("NFKD", download_name).encode("ascii", "ignore").decode("ascii")
+            resp.headers.set("Content-Disposition", "attachment",
+                             filename=simple, **{"filename*": f"UTF-8''{quote(download_name, safe='')}"})
+        resp.headers["Accept-Ranges"] = "bytes"
+    else:
+        # conditional=True sets ETag/Last-Modified and answers Range, If-None-Match and
+        # If-Modified-Since requests (304 without a body)
+        resp = send_file(
+            full_path,
+            mimetype=mimetype,
+            as_attachment=True,
+            download_name=download_name,
+            conditional=True,
+            max_age=DOWNLOAD_MAX_AGE,
+        )
+    resp.cache_control.public = False
+    resp.cache_control.private = True
+    resp.cache_control.max_age = DOWNLOAD_MAX_AGE
+    return resp
+
+@app.route("/files/<int:file_id>/download", methods=["GET"])
+def download_file(file_id: int):
+    """
+    description: Retrieves file metadata from the database using a file ID, constructs the safe 
+                 filesystem path, verifies file existence, determines the MIME type, and streams 
+                 the file back to the client as an attachment.
+
+    args:
+        file_id (int): The unique database identifier for the file being requested.
+
+    returns:
+        flask.Response: A Flask response object containing the file data, headers configured 
+                        for download (Content-Disposition), and the appropriate MIME type.
+
+    raises:
+        HTTPException (404 Not Found): 
+            If the file_id does not exist in the database.
             If the internal function _safe_join_file raises a FileNotFoundError (e.g., path traversal detected).
             If the computed full_path does not exist on the filesystem ("File not in folder").
     """
     
-    file_row = _get_file_row(file_id)
-    if not file_row:
+    file_row = _get_file_row_cached(file_id)
+    if file_row is None:
         abort(404, description = "Invalid file")
+    file_name = file_row["file_name"]
     try:
-        path_in_db = (file_row.get("file_name") or "").strip()
+        path_in_db = (file_name or "").strip()
         full_path = _safe_join_file(file_base_directory, path_in_db)
     except FileNotFoundError as e:
         abort(404, description=str(e))
 
-    if not os.path.exists(full_path):
-        abort(404, description="File not in folder")
-
-    guessed, _ = mimetypes.guess_type(file_row.get("file_name") or full_path)
+    guessed, _ = mimetypes.guess_type(file_name or full_path)
     app.logger.info("DOWNLOAD full_path=%s base=%s dbpath=%s",
                  full_path, file_base_directory, path_in_db)
 
-    return send_file(
-        full_path,
-        mimetype=guessed or "application/octet-stream",
-        as_attachment=True,
-        download_name=file_row.get("file_name") or os.path.basename(full_path),
-        conditional=True,
-    )
+    # send_file stats the file itself, so a missing file surfaces here instead of a separate exists() check
+    try:
+        return _send_download(
+            full_path,
+            file_base_directory,
+            "files",
+            mimetype=guessed or "application/octet-stream",
+            download_name=file_name or os.path.basename(full_path),
+        )
+    except FileNotFoundError:
+        abort(404, description="File not in folder")
     
 @app.route("/question/<int:question_id>/download_image", methods=["GET"])
 def download_question_image(question_id: int):
@@ -798,7 +1696,7 @@ def download_question_image(question_id: int):
             If the database value for 'page_image_paths' is present but cannot be parsed as valid JSON.
     """
     
-    question_row = _get_question_row(question_id)
+    question_row = _get_question_row_cached(question_id)
     if not question_row:
         abort(404, description="Invalid question ID")
 
@@ -807,7 +1705,7 @@ def download_question_image(question_id: int):
         abort(404, description="No images found for this question")
 
     try:
-        image_paths = json.loads(image_paths_json)
+        image_paths = _loads(image_paths_json)
     except Exception:
         abort(500, description="Failed to parse image paths")
 
@@ -834,15 +1732,16 @@ def download_question_image(question_id: int):
     app.logger.info("DOWNLOAD_IMAGE full_path=%s base=%s dbpath=%s",
                     full_path, question_media_base_directory, first_image_path)
 
-    return send_file(
+    return _send_download(
         full_path,
+        question_media_base_directory,
+        "media",
         mimetype=guessed or "image/png", # Default to image/png
-        as_attachment=True,
         download_name=download_name,
-        conditional=True,
     )
     
 _SENT_SPLIT = re.compile(r'[.!?]')
+_WORD_RE = re.compile(r"\b\w+\b")
 
 def _syllable_count(w):
     """
@@ -888,7 +1787,7 @@ def _compute_readability_features(texts):
 
         t = t if isinstance(t, str) else ""
 
-        tokens = re.findall(r"\b\w+\b", t)
+        tokens = _WORD_RE.findall(t)
 
         n_w = len(tokens) if tokens else 1
 
@@ -905,14 +1804,58 @@ def _compute_readability_features(texts):
         # Flesch-Kincaid Grade Level (higher = harder)
 
 # ---- Difficulty Rating Model ----
-# Load the difficulty rating model
-_load_training_helpers()
+def _get_difficulty_model():
+    """
+    Load the difficulty rating model on first use (thread-safe) and return it
+    Loading is attempted once per process; a failure is logged and not retried
 
-try:
-    difficulty_model = joblib.load(MODEL_PATH)
-    app.logger.info(f"[difficulty] Loaded model: {MODEL_PATH}")
-except Exception as e:
-    app.logger.warning(f"[difficulty] Model not loaded ({MODEL_PATH}): {e}")
+    Args:
+        None
+
+    Returns:
+        Fitted model pipeline, or None if it could not be loaded
+    """
+    global difficulty_model, _model_load_attempted
+    if _model_load_attempted:
+        return difficulty_model
+    with _model_lock:
+        if not _model_load_attempted:
+            import joblib
+
+            _load_training_helpers()
+            try:
+                # Arrays are memory-mapped read-only, so every worker shares them through the page cache
+                difficulty_model = joblib.load(MODEL_PATH, mmap_mode="r")
+                app.logger.info(f"[difficulty] Loaded model: {MODEL_PATH}")
+            except Exception as e:
+                app.logger.warning(f"[difficulty] Model not loaded ({MODEL_PATH}): {e}")
+            _model_load_attempted = True
+    return difficulty_model
+
+# Number of predictions echoed back in the /predict_difficulty response
+PREDICT_PREVIEW_LIMIT = 100
+# Rows written per UPDATE statement by _update_model_ratings (keeps statements well under max_allowed_packet)
+PREDICT_UPDATE_CHUNK = 1000
+
+def _update_model_ratings(cur, to_update: list) -> None:
+    """
+    Write predicted ratings with one UPDATE per PREDICT_UPDATE_CHUNK rows
+    (executemany would send one UPDATE per row)
+
+    Args:
+        cur (MySQLdb cursor): Cursor on an open transaction
+        to_update (list[tuple]): (difficulty_rating_model, question id) pairs
+    """
+    for start in range(0, len(to_update), PREDICT_UPDATE_CHUNK):
+        chunk = to_update[start:start + PREDICT_UPDATE_CHUNK]
+        cases = " ".join(["WHEN %s THEN %s"] * len(chunk))
+        ids = ",".join(["%s"] * len(chunk))
+        params = [v for yhat, q_id in chunk for v in (q_id, yhat)] + [q_id for _, q_id in chunk]
+        cur.execute(f"""
+            UPDATE questions
+               SET difficulty_rating_model = CASE id {cases} END
+             WHERE id IN ({ids})
+        """, params)
 
 @app.route("/predict_difficulty", methods=["POST"])
 def predict_difficulty():
@@ -925,6 +1868,8 @@ def predict_difficulty():
         file_id (int, optional): If provided, restricts difficulty prediction to only files in 'file_id'
         dry_run (int, optional): If dry_run=1, does not fill in the value in the database, and only return result
                                     Default 0 to fill in the difficulty_rating_model field
+        async (int, optional): If async=1, run in the background and return 202 with a job_id
+                                    to poll at /api/predict_status/<job_id>
 
         JSON body: {} (empty object). Body required for POST
 
@@ -933,7 +1878,7 @@ def predict_difficulty():
             200 with {"processed": int, # number of rows predicted
                     "updated" int, # number of rows written
                     "dry_run": bool,
-                    "items": [
+                    "items": [ # first PREDICT_PREVIEW_LIMIT predictions only
                     {
                     "id": int,
                     "question_base_id": int,
@@ -943,19 +1888,54 @@ def predict_difficulty():
                     ...
                 ]
             }
-            500 with {"error": "model not loaded"} if the model cannot be reached
+            202 with {"status": "queued", "job_id": str, "status_url": str} when async=1
+            409 with {"error": "prediction_in_progress"} if another run is already writing
+                ratings (dry runs do not wait for it); an async job fails with the same code
+            503 with {"error": "model not loaded"} if the model cannot be reached
     
     Raises:
         Database and model errors handled and returned as 4xx/5xx flask responses
     """
-    if difficulty_model is None:
+    if _get_difficulty_model() is None:
         return jsonify({"error": "model not loaded"}), 503
 
     file_id = request.args.get("file_id", type=int)
     dry_run = request.args.get("dry_run", default=0, type=int) == 1
 
-    # SQL portion
-    where = "WHERE q.difficulty_rating_manual IS NULL"
+    if request.args.get("async", default=0, type=int) == 1:
+        job_id = uuid.uuid4().hex
+        _write_job(job_id, {"status": "queued"})
+        _PREDICT_EXECUTOR.submit(_predict_difficulty_job, job_id, file_id, dry_run)
+        return jsonify({
+            "status": "queued",
+            "job_id": job_id,
+            "status_url": f"/api/predict_status/{job_id}"
+        }), 202
+
+    result = _predict_difficulty(file_id, dry_run)
+    if result is None:
+        return jsonify({"error": "prediction_in_progress"}), 409
+    return _json_response(result)
+
+# Background /predict_difficulty?async=1 runs, one at a time per worker. Writing runs are
+# serialised across workers (and with sync calls) by the MySQL named lock below
+_PREDICT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="predict")
+_PREDICT_LOCK_NAME = "predict_difficulty"
+
+def _predict_difficulty(file_id, dry_run: bool) -> dict:
+    """
+    Predict (and unless dry_run, store) model ratings for questions without a manual rating
+
+    Args:
+        file_id (int/None): Restrict to this file's questions
+        dry_run (bool): Only predict, do not write difficulty_rating_model
+
+    Returns:
+        dict/None: The /predict_difficulty response body ("processed", "updated", "dry_run", "items"),
+            or None if another writing run (in any worker) holds the prediction lock
+    """
+    # SQL portion; rows are read in id order, one page of PREDICT_UPDATE_CHUNK at a time
+    where = "WHERE q.difficulty_rating_manual IS NULL AND q.id > %s"
     args = []
     if file_id:
         where += " AND q.file_id=%s"
@@ -966,40 +1946,275 @@ def predict_difficulty():
                q.question_type, q.question_stem, q.concept_tags
         FROM questions q
         {where}
+        ORDER BY q.id
+        LIMIT {PREDICT_UPDATE_CHUNK}
+    """
+
+    results = []
+    processed = 0
+    last_id = 0
+
+    # One connection and one transaction: each page is predicted and its UPDATE sent before
+    # the next page is read, so memory stays O(PREDICT_UPDATE_CHUNK), and a failed run
+    # rolls back instead of leaving some ratings rewritten
+    with closing(get_connection()) as conn, closing(conn.cursor(DictCursor)) as cur:
+        if not dry_run:
+            # Named lock, so writing runs do not overlap across gunicorn workers either.
+            # It belongs to the pooled session, so it must be released before conn goes back
+            cur.execute("SELECT GET_LOCK(%s, 0) AS acquired", (_PREDICT_LOCK_NAME,))
+            if cur.fetchone()["acquired"] != 1:
+                return None
+        try:
+            while True:
+                cur.execute(sql, (last_id, *args))
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1]["id"]
+                yhats = predict_rows(rows)
+                # Only the preview rows are returned; the rest are just written back
+                for r, yhat in zip(rows[:max(0, PREDICT_PREVIEW_LIMIT - processed)], yhats):
+                    results.append({
+                        "id": r["id"],
+                        "question_base_id": r["question_base_id"],
+                        "file_id": r["file_id"],
+                        "difficulty_rating_model": round(yhat, 4),
+                    })
+                processed += len(rows)
+                if not dry_run:
+                    _update_model_ratings(cur, [(yhat, r["id"]) for r, yhat in zip(rows, yhats)])
+            if not dry_run:
+                conn.commit()
+                _invalidate_get_question_caches()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            if not dry_run:
+                try:
+                    cur.execute("SELECT RELEASE_LOCK(%s)", (_PREDICT_LOCK_NAME,))
+                    cur.fetchall()
+                except MySQLdb.Error:
+                    pass  # a lost session has already dropped the lock
+
+    return {
+        "processed": processed,
+        "updated": 0 if dry_run else processed,
+        "dry_run": dry_run,
+        "items": results,
+    }
+
+def _predict_difficulty_job(job_id: str, file_id, dry_run: bool) -> None:
     """
+    Background task for /predict_difficulty?async=1: runs the prediction and records
+    the outcome in the job's status file
 
-    to_update, results = [], []
+    Args:
+        job_id (str): 32-char hex job id
+        file_id (int/None): As for _predict_difficulty
+        dry_run (bool): As for _predict_difficulty
+    """
+    _write_job(job_id, {"status": "running"})
+    try:
+        result = _predict_difficulty(file_id, dry_run)
+        if result is None:
+            _write_job(job_id, {"status": "failed", "error": "prediction_in_progress"})
+        else:
+            _write_job(job_id, {"status": "done", **result})
+    except Exception:
+        app.logger.exception(f"Background prediction failed for job {job_id}")
+        _write_job(job_id, {"status": "failed", "error": "prediction_failed"})
 
-    with closing(get_connection()) as conn:
-        cur = conn.cursor(MySQLdb.cursors.DictCursor)
-        cur.execute(sql, tuple(args))
-        rows = cur.fetchall()
+@app.get("/api/predict_status/<job_id>")
+def predict_status(job_id: str):
+    """
+    Report the state of a prediction run started with /predict_difficulty?async=1
 
-        for r in rows:
-            yhat = predict_row(r)
-            results.append({
-                "id": r["id"],
-                "question_base_id": r["question_base_id"],
-                "file_id": r["file_id"],
-                "difficulty_rating_model": round(yhat, 4),
-            })
-            if not dry_run:
-                to_update.append((yhat, r["id"]))
-
-        if not dry_run and to_update:
-            cur.executemany("""
-                UPDATE questions
-                   SET difficulty_rating_model = %s
-                 WHERE id = %s
-            """, to_update)
-            conn.commit()
+    Args:
+        job_id (str): Job id returned in the 202 response of /predict_difficulty
 
-    return jsonify({
-        "processed": len(results),
-        "updated": 0 if dry_run else len(to_update),
-        "dry_run": dry_run,
-        "items": results[:100],
-    })
+    Returns:
+        flask.Response (application/json):
+            200 with {"status": "queued" | "running" | "done" | "failed", ...}
+                once done, the body also carries the /predict_difficulty result
+            404 with {"error": "job_not_found"} if the job id is unknown, or finished
+                more than JOB_TTL seconds ago (default a day)
+    """
+    job = _read_job(job_id)
+    if job is None:
+        return jsonify({"error": "job_not_found", "job_id": job_id}), 404
+    return jsonify(job), 200
+
+# ---- Upload Pipeline Helpers ----
+# Background pipeline runs; the steps are subprocesses, so threads are enough
+_PIPELINE_EXECUTOR = ThreadPoolExecutor(max_workers=int(os.getenv("PIPELINE_WORKERS", "2")),
+                                        thread_name_prefix="pipeline")
+_JOB_ID_RE = re.compile(r"[0-9a-f]{32}")
+# Finished job files are deleted JOB_TTL seconds after their last update (checked at most
+# every JOB_SWEEP_INTERVAL seconds per worker, when a job finishes)
+JOB_TTL = int(os.getenv("JOB_TTL", "86400"))
+JOB_SWEEP_INTERVAL = int(os.getenv("JOB_SWEEP_INTERVAL", "600"))
+_last_job_sweep = 0.0
+
+def _job_path(job_id: str) -> Path:
+    """
+    Resolve the status file of a background job
+    Job state lives on disk so that every gunicorn worker can answer status requests
+
+    Args:
+        job_id (str): 32-char hex job id
+
+    Returns:
+        pathlib.Path: Path to the job's JSON status file
+    """
+    return JOBS_DIR / f"{job_id}.json"
+
+def _write_job(job_id: str, state: dict) -> None:
+    """
+    Atomically write the state of a background job
+
+    Args:
+        job_id (str): 32-char hex job id
+        state (dict): JSON-serialisable job state
+    """
+    global _last_job_sweep
+    path = _job_path(job_id)
+    tmp = path.with_suffix(".tmp")
+    # _encode_json, like responses: job states can carry datetimes and orjson fragments
+    data = _encode_json(state)
+    tmp.write_bytes(data if isinstance(data, bytes) else data.encode("utf-8"))
+    os.replace(tmp, path)
+
+    if state.get("status") in ("done", "failed") and time.monotonic() - _last_job_sweep > JOB_SWEEP_INTERVAL:
+        _last_job_sweep = time.monotonic()
+        _sweep_jobs()
+
+def _sweep_jobs() -> None:
+    """
+    Delete the status files of finished (done/failed) jobs not updated for JOB_TTL seconds
+    Queued and running jobs are kept whatever their age
+    """
+    cutoff = time.time() - JOB_TTL
+    for path in JOBS_DIR.glob("*.json"):
+        try:
+            if path.stat().st_mtime < cutoff and _loads(path.read_bytes()).get("status") in ("done", "failed"):
+                path.unlink(missing_ok=True)
+        except (OSError, ValueError):
+            continue  # removed by another worker, or caught mid-write
+
+_sweep_jobs()
+
+def _read_job(job_id: str):
+    """
+    Read the state of a background job
+
+    Args:
+        job_id (str): Job id supplied by the client
+
+    Returns:
+        dict/None: Job state, or None if the id is malformed or unknown
+    """
+    if not _JOB_ID_RE.fullmatch(job_id or ""):
+        return None
+    try:
+        return _loads(_job_path(job_id).read_bytes())
+    except FileNotFoundError:
+        return None
+
+def _run_upload_pipeline(file_id, candidate_name: str):
+    """
+    Run the 3-step parsing pipeline (extract -> LLM parse -> insert) for a stored PDF
+
+    Args:
+        file_id (int): files.id the parsed questions should be linked to
+        candidate_name (str): Stored filename of the PDF in the source directory
+
+    Returns:
+        tuple[dict, str/None]:
+            - logs (dict): {step: {"code", "stdout", "stderr"}} for every step that ran
+            - error (str/None): "<step> failed" for the first failing step, None on success
+    """
+    base = Path(candidate_name).stem
+    logs = {}
+    steps = (
+        # 1) Extract text
+        ("pdf_extractor", {"TARGET_PDF": candidate_name}),
+        # 2) LLM parse
+        ("llm_parser", {"TARGET_BASE": base}),
+        # 3) Insert questions
+        # Pass file_id to insertion script for linking
+        ("insert_questions", {"TARGET_BASE": base, "FILE_ID": str(file_id)}),
+    )
+    # Each step stays a subprocess: the scripts read their inputs from os.environ and report via
+    # print, which are process-global and would race between concurrent uploads if run in-process.
+    # sys.executable reuses this interpreter (and its venv) without a PATH lookup.
+    for step, env_extra in steps:
+        code, out, err = _run(f"{shlex.quote(sys.executable)} {step}.py", env_extra=env_extra)
+        logs[step] = {"code": code, "stdout": out, "stderr": err}
+        if code != 0:
+            return logs, f"{step} failed"
+    # insert_questions.py wrote the new questions from its own process
+    _invalidate_get_question_caches()
+    return logs, None
+
+def _fetch_uploaded_questions(file_id):
+    """
+    Fetch the questions inserted for an uploaded file
+    Called once insert_questions.py has exited: it commits before exiting, so its rows are
+    already visible and there is nothing to wait for
+
+    Args:
+        file_id (int): files.id of the uploaded file
+
+    Returns:
+        list[dict]: /getquestion items (only for serialising with _encode_json), ordered
+            by question_no (empty if nothing was inserted or the fetch failed)
+    """
+    try:
+        with closing(get_connection()) as conn, closing(conn.cursor()) as cur:
+            cur.execute(f"""
+                SELECT {", ".join(_GET_QUESTION_COLS)}
+                FROM questions q
+                JOIN files f ON f.id = q.file_id
+                WHERE q.file_id = %s
+                ORDER BY q.question_no ASC, q.id ASC
+            """, (file_id,))  # idx_file_question_no serves the filter and the order
+            rows = cur.fetchall()
+    except MySQLdb.Error:
+        # The questions are stored; the client can still load them from /getquestion
+        app.logger.exception(f"Failed to fetch uploaded questions for file {file_id}")
+        return []
+
+    # Same items as /getquestion; the edit page reads the manual rating by its column name
+    items = [_get_question_item(row) for row in rows]
+    for item in items:
+        item["difficulty_rating_manual"] = item["difficulty_manual"]
+    return items
+
+def _upload_pipeline_job(job_id: str, file_info: dict) -> None:
+    """
+    Background task for /api/upload_file?async=1: runs the pipeline and records
+    the outcome in the job's status file
+
+    Args:
+        job_id (str): 32-char hex job id
+        file_info (dict): "file" block of the upload response (file_id, stored_filename, ...)
+    """
+    _write_job(job_id, {"status": "running", "file": file_info})
+    try:
+        logs, error = _run_upload_pipeline(file_info["file_id"], file_info["stored_filename"])
+        if error:
+            _write_job(job_id, {"status": "failed", "file": file_info, "pipeline": logs, "error": error})
+            return
+        _write_job(job_id, {
+            "status": "done",
+            "file": file_info,
+            "pipeline": logs,
+            "newly_inserted_questions": _fetch_uploaded_questions(file_info["file_id"])
+        })
+    except Exception:
+        app.logger.exception(f"Background pipeline failed for job {job_id}")
+        _write_job(job_id, {"status": "failed", "file": file_info, "error": "pipeline_failed"})
 
 # ---- Upload Route (MODIFIED) ----
 @app.post("/api/upload_file")
@@ -1023,6 +2238,10 @@ def upload_file():
         - semester (str, optional)
         - assessment_type (str, optional)
 
+    Query parameters:
+        - async (int, optional): If async=1, run the pipeline in the background and
+          return 202 with a job_id to poll at /api/upload_status/<job_id>
+
     Returns:
         flask.Response (application/json):
             - 201 on success:
@@ -1040,6 +2259,7 @@ def upload_file():
                     "insert_questions": {...}
                   }
                 }
+            - 202 with {"saved": true, "file": {...}, "job_id": "...", "status_url": "..."} when async=1
             - 400 on bad upload (no file, wrong type, invalid PDF header)
             - 500 if a pipeline step fails (upload is still saved)
 
@@ -1050,51 +2270,61 @@ def upload_file():
 
     print("--- STARTING UPLOAD HANDLER ---")
     # --- 1. INITIAL SETUP & VALIDATION ---
-    course = request.form.get("course")
+    course = _normalize_course(request.form.get("course"))
     year = request.form.get("year")
     semester = request.form.get("semester")
     # Using 'or "others"' ensures assessment_type is never NULL for DB insert
     assessment_type = request.form.get("assessment_type") or "others" 
+    run_async = request.args.get("async", default=0, type=int) == 1
+
+    # Where downloads look for files; uploads are spooled next to it until validated
+    base_dir = _upload_dir()
+    staging_dir = _upload_staging_dir()
 
     if "file" not in request.files:
         return jsonify({"error": "No file part"}), 400
     f = request.files["file"]
-    if not f or f.filename == "":
-        return jsonify({"error": "No selected file"}), 400
-    if not _allowed_pdf(f.filename):
-        return jsonify({"error": "Only .pdf allowed"}), 400
 
+    # UploadRequest already spooled the part to a .part file in staging_dir; adopt it as the
+    # temp file, or copy the stream if it lives elsewhere (e.g. a request built in memory)
+    spooled = getattr(f.stream, "name", None)
+    if isinstance(spooled, str) and Path(spooled).parent == staging_dir:
+        tmp_path = Path(spooled)
+        with f.stream:
+            head = f.stream.read(5)
+    else:
+        head = f.stream.read(5)
+        f.stream.seek(0)
+        tmp_fd, tmp_name = tempfile.mkstemp(suffix=".pdf.part", dir=staging_dir)
+        tmp_path = Path(tmp_name)
+        with os.fdopen(tmp_fd, "wb") as w:
+            shutil.copyfileobj(f.stream, w, 1024 * 1024)
+
+    error = None
+    if not f or f.filename == "":
+        error = "No selected file"
+    elif not _allowed_pdf(f.filename):
+        error = "Only .pdf allowed"
     # Basic PDF magic header check
-    head = f.stream.read(5)
-    f.stream.seek(0)
-    if head != b"%PDF-":
-        return jsonify({"error": "Invalid PDF header"}), 400
-
-    # Where downloads look for files
-    base_dir = Path(os.getenv("file_base_directory", "/data/source_files"))
-    base_dir.mkdir(parents=True, exist_ok=True)
+    elif head != b"%PDF-":
+        error = "Invalid PDF header"
+    if error:
+        tmp_path.unlink(missing_ok=True)
+        return jsonify({"error": error}), 400
 
     # Secure the original name
     original_name = secure_filename(f.filename)
 
-    # Stream to a temp file while hashing
-    h = hashlib.sha256()
-    tmp_path = Path(tempfile.mkstemp(suffix=".pdf")[1])
-    with open(tmp_path, "wb") as w:
-        while True:
-            chunk = f.stream.read(1024 * 1024)
-            if not chunk:
-                break
-            h.update(chunk)
-            w.write(chunk)
-    short_hash = h.hexdigest()[:8]
-
     # Choose final filename
     stem = Path(original_name).stem
     suffix = Path(original_name).suffix or ".pdf"
     candidate_name = original_name
     dest_path = base_dir / candidate_name
     if dest_path.exists():
+        # The content hash is only needed to disambiguate a taken name
+        # (file_digest reads in C with the GIL released, using OpenSSL's SHA-256)
+        with open(tmp_path, "rb") as r:
+            short_hash = hashlib.file_digest(r, "sha256").hexdigest()[:8]
         candidate_name = f"{stem}_{short_hash}{suffix}"
         dest_path = base_dir / candidate_name
     # Assuming dest_path is correctly relative to '/app'
@@ -1114,11 +2344,13 @@ def upload_file():
             )
             conn.commit()
             file_id = cur.lastrowid
-    except Exception as e:
+        _invalidate_file_ids()
+    except MySQLdb.Error:
+        app.logger.exception(f"PDF saved as {candidate_name} but its files row insert failed")
         return jsonify({
             "saved": True,
             "message": "PDF saved but DB insert failed",
-            "db_error": str(e),
+            "db_error": "insert_failed",
             "path": str(dest_path)
         }), 201
 
@@ -1129,120 +2361,70 @@ def upload_file():
             SRC_DIR.mkdir(parents=True, exist_ok=True)
             mirror_path = SRC_DIR / candidate_name
             if not mirror_path.exists():
-                shutil.copyfile(dest_path, mirror_path)
+                # The extractor reads the mirror next, so it must exist before returning;
+                # a hard link makes it without copying the bytes (copy across filesystems)
+                try:
+                    os.link(dest_path, mirror_path)
+                except OSError:
+                    shutil.copyfile(dest_path, mirror_path)
     except Exception as e:
         app.logger.warning(f"Mirror to SRC_DIR failed: {e}")
 
-    # --- 3. PIPELINE EXECUTION ---
-    base = Path(candidate_name).stem
-    logs = {}
-
-    # 1) Extract text 
-    code, out, err = _run("python pdf_extractor.py", env_extra={"TARGET_PDF": candidate_name})
-    logs["pdf_extractor"] = {"code": code, "stdout": out, "stderr": err}
-    if code != 0:
-        return jsonify({"saved": True, "file_id": file_id, "pipeline": logs, "error": "pdf_extractor failed"}), 500
-
-    # 2) LLM parse
-    code, out, err = _run("python llm_parser.py", env_extra={"TARGET_BASE": base})
-    logs["llm_parser"] = {"code": code, "stdout": out, "stderr": err}
-    if code != 0:
+    file_info = {
+        "file_id": file_id,
+        "original_name": original_name,
+        "stored_filename": candidate_name,
+        "stored_path": str(dest_path)
+    }
+
+    # --- 3a. BACKGROUND PIPELINE (opt-in with ?async=1) ---
+    if run_async:
+        job_id = uuid.uuid4().hex
+        _write_job(job_id, {"status": "queued", "file": file_info})
+        _PIPELINE_EXECUTOR.submit(_upload_pipeline_job, job_id, file_info)
         return jsonify({
-            "saved": True, "file_id": file_id, "pipeline": logs, "error": "llm_parser failed"
-        }), 500
-
-    # 3) Insert questions 
-    # Pass file_id to insertion script for linking
-    code, out, err = _run(
-        "python insert_questions.py", 
-        env_extra={"TARGET_BASE": base, "FILE_ID": str(file_id)}
-    )
-    logs["insert_questions"] = {"code": code, "stdout": out, "stderr": err}
-    if code != 0:
-        return jsonify({
-            "saved": True, "file_id": file_id, "pipeline": logs, "error": "insert_questions failed"
-        }), 500
+            "saved": True,
+            "file": file_info,
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/api/upload_status/{job_id}"
+        }), 202
 
-    # RETRIEVE QUESTIONS & RETURN TO CLIENT
-    new_questions = []
-    select_cols = [
-        "q.id", "q.question_base_id", "q.version_id", "q.file_id", "q.question_no",
-        "q.question_type", "q.question_stem", "q.question_stem_html",
-        "q.concept_tags", "q.page_image_paths",
-        "q.last_used", "q.created_at", "q.updated_at",
-        "q.question_options", "q.question_answer",
-        "q.difficulty_rating_manual", "q.difficulty_rating_model",
-        "f.course", "f.year", "f.semester", "f.assessment_type", "f.file_name", "f.file_path"
-    ]
-    max_attempts = 12       
-    base_wait = 5           
-    
-    for attempt in range(max_attempts):
-        try:
-            # Use dictionary=True for safer, named column access
-            with closing(get_connection()) as conn, closing(conn.cursor(DictCursor)) as cur: 
-                sql = f"""
-                    SELECT {", ".join(select_cols)}
-                    FROM questions q
-                    JOIN files f ON f.id = q.file_id
-                    WHERE q.file_id = %s
-                    ORDER BY q.question_no ASC, q.id ASC
-                """
-                cur.execute(sql, (file_id,))
-                rows = cur.fetchall()
-            
-            if rows:
-                for row in rows:
-                    # Map row data to the client's expected structure
-                    new_questions.append({
-                        "id": row["id"],
-                        "question_base_id": row["question_base_id"],
-                        "version_id": row["version_id"],
-                        "file_id": row["file_id"],
-                        "question_no": row["question_no"],
-                        "question_type": row["question_type"],
-                        "question_stem": row["question_stem"],
-                        "question_stem_html": row["question_stem_html"],
-                        "concept_tags": parse_json_field(row["concept_tags"]),
-                        "question_media": parse_json_field(row["page_image_paths"]),
-                        "question_options": parse_json_field(row["question_options"]),
-                        "question_answer": parse_json_field(row["question_answer"]),
-                        "last_used": ts(row["last_used"]),
-                        "created_at": ts(row["created_at"]),
-                        "updated_at": ts(row["updated_at"]),
-                        "difficulty_rating_manual": row["difficulty_rating_manual"],
-                        "difficulty_model": row["difficulty_rating_model"],
-                        "course": row["course"],
-                        "year": row["year"],
-                        "semester": row["semester"],
-                        "assessment_type": row["assessment_type"],
-                        "file_name": row["file_name"],
-                        "file_path": row["file_path"],
-                    })
-                break  # Exit loop once rows are found
-            else:
-                wait_time = min(base_wait * (2 ** attempt), 30)
-                time.sleep(wait_time)
-                
-        except Exception as e:
-            # Log and continue retry in case of transient DB error
-            app.logger.error(f"Database fetch error during backoff: {e}")
-            time.sleep(1) 
+    # --- 3b. PIPELINE EXECUTION ---
+    logs, error = _run_upload_pipeline(file_id, candidate_name)
+    if error:
+        return jsonify({"saved": True, "file_id": file_id, "pipeline": logs, "error": error}), 500
 
+    # RETRIEVE QUESTIONS & RETURN TO CLIENT
+    new_questions = _fetch_uploaded_questions(file_id)
 
     # Include newly_inserted_questions in the final JSON response.
-    return jsonify({
+    return _json_response({
         "saved": True,
-        "file": {
-            "file_id": file_id,
-            "original_name": original_name,
-            "stored_filename": candidate_name,
-            "stored_path": str(dest_path)
-        },
+        "file": file_info,
         "pipeline": logs,
         "newly_inserted_questions": new_questions # THIS IS THE FINAL DATA RETURN
-    }), 201
+    }, 201)
 
+@app.get("/api/upload_status/<job_id>")
+def upload_status(job_id: str):
+    """
+    Report the state of a background upload pipeline started with /api/upload_file?async=1
+
+    Args:
+        job_id (str): Job id returned in the 202 response of /api/upload_file
+
+    Returns:
+        flask.Response (application/json):
+            200 with {"status": "queued" | "running" | "done" | "failed", "file": {...}, ...}
+                once done, the body also carries "pipeline" and "newly_inserted_questions"
+            404 with {"error": "job_not_found"} if the job id is unknown, or finished
+                more than JOB_TTL seconds ago (default a day)
+    """
+    job = _read_job(job_id)
+    if job is None:
+        return jsonify({"error": "job_not_found", "job_id": job_id}), 404
+    return jsonify(job), 200
 
 
 # -----------------------------------------------------
@@ -1277,6 +2459,56 @@ def upload_page():
 Aallowed_question_fields_for_edit = {"question_stem", "concept_tags", "difficulty_rating_manual", "question_type", "question_options", "question_answer"}
 allowed_file_fields_for_edit = {"assessment_type", "course", "year", "semester"}
 
+def _coerce_rating(value):
+    """
+    Coerce an edited difficulty_rating_manual to FLOAT or None
+
+    Raises:
+        ValueError: "invalid_type" if value is not float-like
+    """
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError("invalid_type")
+
+def _coerce_options(value):
+    """
+    Coerce edited question_options to a JSON string (None is kept)
+
+    Raises:
+        ValueError: "invalid_json_format" if value is not a list/dict or valid JSON text
+    """
+    if value is None:
+        return None
+    if isinstance(value, (list, dict)):
+        return _dumps(value)
+    if isinstance(value, str):
+        try:
+            _loads(value) # Just validate
+        except ValueError:
+            raise ValueError("invalid_json_format")
+        return value
+    raise ValueError("invalid_json_format")
+
+def _coerce_answer(value):
+    """
+    Coerce an edited question_answer: lists/dicts become JSON strings, anything else is kept
+    """
+    if isinstance(value, (list, dict)):
+        return _dumps(value)
+    return value
+
+# Per-field normalisation for /api/editquestions, applied while the payload is classified
+_EDIT_COERCERS = {
+    "difficulty_rating_manual": _coerce_rating,
+    "concept_tags": normalize_concept_tags,
+    "question_options": _coerce_options,
+    "question_answer": _coerce_answer,
+    "course": _normalize_course,
+}
+
 @app.route("/api/editquestions/<int:q_id>", methods=["PATCH"]) # PATCH method to allow partial update
 def update_question(q_id):
     """
@@ -1312,102 +2544,98 @@ def update_question(q_id):
     if not payload:
         return jsonify({"error": "empty_body"}), 400
 
-    # Filter to allowed fields only
-    question_updates = {}
-    file_updates = {}
-    for k,v in payload.items():
-        if k in allowed_question_fields_for_edit:
-            question_updates[k] = v
-        elif k in allowed_file_fields_for_edit:
-            file_updates[k] = v
-
-    if not question_updates and not file_updates:
-        return jsonify({"error": "no_allowed_fields"}), 400
-
-    # Handle difficulty_rating_manual: must be a FLOAT or None
-    if "difficulty_rating_manual" in question_updates:
-        try:
-            if question_updates["difficulty_rating_manual"] is None:
-                pass
-            else:
-                question_updates["difficulty_rating_manual"] = float(question_updates["difficulty_rating_manual"])
-        except Exception:
-            return jsonify({"error": "invalid_type",
-                            "field": "difficulty_rating_manual"}), 400
-
-    # Handle concept_tags: normalise to JSON string
-    if "concept_tags" in question_updates:
-        question_updates["concept_tags"] = normalize_concept_tags(question_updates["concept_tags"])
-        
-    # Handle question_options: normalise to JSON string (if provided)
-    if "question_options" in question_updates and question_updates["question_options"] is not None:
-        try:
-            # Ensure it's a JSON string if not already
-            if isinstance(question_updates["question_options"], (list, dict)):
-                question_updates["question_options"] = json.dumps(question_updates["question_options"], ensure_ascii=False)
-            elif isinstance(question_updates["question_options"], str):
-                json.loads(question_updates["question_options"]) # Just validate
-            else:
-                raise ValueError("Invalid format")
-        except:
-             return jsonify({"error": "invalid_json_format", "field": "question_options"}), 400
-             
-    # Handle question_answer: normalise to JSON string if complex type (if provided)
-    if "question_answer" in question_updates and question_updates["question_answer"] is not None:
-        if isinstance(question_updates["question_answer"], (list, dict)):
-            question_updates["question_answer"] = json.dumps(question_updates["question_answer"], ensure_ascii=False)
-
-
-    with closing(get_connection()) as conn:
-        cur = conn.cursor(MySQLdb.cursors.DictCursor)
+    # Filter to allowed fields only, normalising each value in the same pass
+    question_updates = {}
+    file_updates = {}
+    for k, v in payload.items():
+        if k in allowed_question_fields_for_edit:
+            updates = question_updates
+        elif k in allowed_file_fields_for_edit:
+            updates = file_updates
+        else:
+            continue
+        coerce = _EDIT_COERCERS.get(k)
+        if coerce is not None:
+            try:
+                v = coerce(v)
+            except ValueError as e:
+                return jsonify({"error": e.args[0], "field": k}), 400
+        updates[k] = v
 
-        # for questions table edits
-        if question_updates:
-            set_sql = ", ".join(f"{k}=%s" for k in question_updates)
-            cur.execute(f"UPDATE questions SET {set_sql} WHERE id=%s LIMIT 1",
-                        (*question_updates.values(), q_id))
-            conn.commit()
+    if not question_updates and not file_updates:
+        return jsonify({"error": "no_allowed_fields"}), 400
 
-        # for files table edits
-        if file_updates:
-            # first get the file_id
-            cur.execute("SELECT file_id FROM questions WHERE id=%s", (q_id,))
-            row = cur.fetchone()
-            # if not row then file don't exist
-            if not row:
-                return jsonify({"error": "not_found_or_deleted", "id": q_id}), 404
-            file_id = row["file_id"]
-            set_sql = ", ".join(f"{k}=%s" for k in file_updates)
-            cur.execute(f"UPDATE files SET {set_sql} WHERE id=%s LIMIT 1",
-                        (*file_updates.values(), file_id))
-            conn.commit()
-            
-        # Return the updated record, combined files and questions
-        cur.execute("""
-            SELECT q.id, q.question_base_id, q.file_id,
-                   q.question_type, q.question_stem, q.concept_tags,
-                   q.difficulty_rating_manual, q.difficulty_rating_model,
-                   f.assessment_type, f.course, f.year, f.semester,
-                   q.created_at, q.updated_at
-              FROM questions q
-              JOIN files f ON q.file_id = f.id
+    statements, params = [], []
+    # for questions table edits
+    if question_updates:
+        set_sql = ", ".join(f"{k}=%s" for k in question_updates)
+        statements.append(f"UPDATE questions SET {set_sql} WHERE id=%s LIMIT 1")
+        params += [*question_updates.values(), q_id]
+
+    # for files table edits
+    # the JOIN resolves the question's file_id server-side, no separate SELECT needed
+    if file_updates:
+        set_sql = ", ".join(f"f.{k}=%s" for k in file_updates)
+        statements.append(f"""
+            UPDATE files f
+              JOIN questions q ON q.file_id = f.id
+               SET {set_sql}
              WHERE q.id = %s
-        """, (q_id,))
+        """)
+        params += [*file_updates.values(), q_id]
+
+    # Return the updated record, combined files and questions
+    statements.append("""
+        SELECT q.id, q.question_base_id, q.file_id,
+               q.question_type, q.question_stem, q.concept_tags,
+               q.difficulty_rating_manual, q.difficulty_rating_model,
+               f.assessment_type, f.course, f.year, f.semester,
+               q.created_at, q.updated_at
+          FROM questions q
+          JOIN files f ON q.file_id = f.id
+         WHERE q.id = %s
+    """)
+    params.append(q_id)
+
+    # Both table edits commit together (or roll back together), sent as one multi-statement
+    # round trip; the UPDATE results carry no rows, so skip ahead to the SELECT's result set
+    with _transaction() as conn, closing(conn.cursor(MySQLdb.cursors.DictCursor)) as cur:
+        cur.execute(";".join(statements), params)
+        while cur.description is None and cur.nextset():
+            pass
         row = cur.fetchone()
+        while cur.nextset():
+            pass
+    if file_updates:
+        _invalidate_file_ids()
+        if row:
+            _invalidate_cached_row(_FILE_ROW_CACHE, row["file_id"])
+
+    # if not row then question (or its file) don't exist
+    if not row:
+        return jsonify({"error": "not_found_or_deleted", "id": q_id}), 404
 
     # convert concept_tags back from JSON string to Python List for readibility
-    if row and row.get("concept_tags"):
+    if row.get("concept_tags"):
         row["concept_tags"] = parse_json_field(row["concept_tags"])
-        
-    # convert dates to string
-    if row and row.get("created_at"):
-        row["created_at"] = ts(row["created_at"])
-    if row and row.get("updated_at"):
-        row["updated_at"] = ts(row["updated_at"])
 
-    return jsonify(row), 200
+    # _json_response writes created_at/updated_at as ISO 8601, same as ts()
+    return _json_response(row)
 
 # ---- Hard Deletion Route ----
+# Deletes a question and, if it was the file's last question, the file row too.
+# The final SELECT reports (question deleted, its file_id, file deleted); the user variables
+# are reassigned on every call, so reuse of pooled connections is safe
+_DELETE_QUESTION_SQL = """
+    SET @del_file_id := (SELECT file_id FROM questions WHERE id = %s);
+    DELETE FROM questions WHERE id = %s LIMIT 1;
+    SET @del_question := ROW_COUNT();
+    DELETE FROM files
+     WHERE id = @del_file_id AND @del_question > 0
+       AND NOT EXISTS (SELECT 1 FROM questions WHERE file_id = @del_file_id);
+    SELECT @del_question, @del_file_id, ROW_COUNT()
+"""
+
 @app.route("/api/deletequestion/<int:q_id>", methods=["DELETE"])
 def delete_question(q_id):
     """
@@ -1424,55 +2652,88 @@ def delete_question(q_id):
             200 with {"status": "deleted_permanently", "id": q_id} if successful
             400 with {"error": "confirmation_required", ...} if confirmation not stated/invalid.
             404 with {"status": "not_found", "id": q_id} if q_id does not exist in 'questions' table
-            500 with {"error": "delete_failed", ..." if error in database.
+            500 with {"error": "delete_failed"} if error in database.
 
     Raises:
         All exceptions handled and returned as 4xx/5xx flask responses.
 
     """
 
-    deleted_file_id = None
-    
-    with closing(get_connection()) as conn:
-        cur = conn.cursor()
-        
-        # 1. Get file_id before deleting the question
-        try:
-            cur.execute("SELECT file_id FROM questions WHERE id = %s", (q_id,))
-            file_id_row = cur.fetchone()
-            if file_id_row:
-                deleted_file_id = file_id_row[0]
-        except Exception as e:
-            app.logger.warning(f"Error fetching file_id for QID {q_id}: {e}")
-        
-        # 2. Delete the question from the questions table
-        try:
-            cur.execute("DELETE FROM questions WHERE id = %s LIMIT 1", (q_id,))
-            if cur.rowcount == 0:
-                conn.commit()
-                return jsonify({"status": "not_found", "id": q_id}), 404
-            
-            # 3. Clean up orphaned file record if a file_id was found
-            if deleted_file_id is not None:
-                
-                # Count remaining questions linked to this file_id
-                cur.execute("SELECT COUNT(*) FROM questions WHERE file_id = %s", (deleted_file_id,))
-                remaining_count = cur.fetchone()[0]
-                
-                # 4. If count is zero, delete the file record
-                if remaining_count == 0:
-                    app.logger.info(f"Deleting orphaned file container with ID {deleted_file_id}")
-                    cur.execute("DELETE FROM files WHERE id = %s LIMIT 1", (deleted_file_id,))
-            
-            conn.commit()
-            return jsonify({"status": "deleted_permanently", "id": q_id}), 200
-
-        except Exception as e:
-            conn.rollback()
-            app.logger.error(f"Transaction failed during question delete for QID {q_id}: {e}")
-            return jsonify({"error": "delete_failed", "message": str(e)}), 500
+    try:
+        with _transaction() as conn, closing(conn.cursor()) as cur:
+            # One round trip: delete the question, then its file if no questions remain
+            cur.execute(_DELETE_QUESTION_SQL, (q_id, q_id))
+            while cur.description is None and cur.nextset():
+                pass
+            deleted, deleted_file_id, file_deleted = cur.fetchone()
+            while cur.nextset():
+                pass
+        deleted = bool(deleted)
+
+        if deleted:
+            _invalidate_cached_row(_QUESTION_ROW_CACHE, q_id)
+        if file_deleted:
+            app.logger.info(f"Deleted orphaned file container with ID {deleted_file_id}")
+            _invalidate_cached_row(_FILE_ROW_CACHE, deleted_file_id)
+            _invalidate_file_ids()
+    except MySQLdb.Error:
+        app.logger.exception(f"Transaction failed during question delete for QID {q_id}")
+        return jsonify({"error": "delete_failed"}), 500
+
+    if not deleted:
+        return jsonify({"status": "not_found", "id": q_id}), 404
+    return jsonify({"status": "deleted_permanently", "id": q_id}), 200
 
 # ---- Add Question Route ----
+# Single-question INSERT shared by /addquestion and /api/createquestion, built once at import
+_INSERT_QUESTION_PREFIX = """
+    INSERT INTO questions (
+        question_base_id, version_id, file_id,
+        question_no, page_numbers, question_type,
+        difficulty_rating_manual, difficulty_rating_model,
+        question_stem, question_stem_html,
+        question_options, question_answer,
+        page_image_paths, concept_tags,
+        last_used
+    ) VALUES """
+# created_at/updated_at are filled by their DEFAULT CURRENT_TIMESTAMP column defaults
+_INSERT_QUESTION_SQL = _INSERT_QUESTION_PREFIX + """(
+        %s,%s,%s,
+        %s,%s,%s,
+        %s,%s,
+        %s,%s,
+        %s,%s,
+        %s,%s,
+        %s
+    )"""
+
+# A new question starts its own version chain: question_base_id = its own id.
+# LAST_INSERT_ID() is per connection, so this is safe under concurrent inserts.
+_SET_OWN_BASE_ID_SQL = "UPDATE questions SET question_base_id = LAST_INSERT_ID() WHERE id = LAST_INSERT_ID()"
+_INSERT_QUESTION_BATCH_SQL = f"{_INSERT_QUESTION_SQL};\n{_SET_OWN_BASE_ID_SQL}"
+
+def _insert_question(cur, data: tuple) -> int:
+    """
+    Insert one question and point its question_base_id at itself, sent as a single
+    multi-statement batch (one round trip instead of INSERT then UPDATE)
+
+    Args:
+        cur (MySQLdb cursor): Cursor on a pooled connection (MULTI_STATEMENTS enabled)
+        data (tuple): Values for _INSERT_QUESTION_SQL
+
+    Returns:
+        int: id of the new question
+
+    Raises:
+        MySQLdb.Error: If either statement fails (the caller rolls back)
+    """
+    cur.execute(_INSERT_QUESTION_BATCH_SQL, data)
+    # lastrowid belongs to the INSERT result; read it before moving to the UPDATE result
+    new_id = cur.lastrowid
+    while cur.nextset():
+        pass
+    return new_id
+
 @app.route("/addquestion", methods=["POST"])
 def addquestion():
     """
@@ -1494,13 +2755,18 @@ def addquestion():
                 - concept_tags (list/tuple/JSON string/str): will be normalised to JSON.
                 - question_options (list/dict/JSON string): stored as JSON string.
                 - question_answer (JSON)L store as JSON.
+        Query params:
+            - async (int, optional): If async=1, queue the insert for the background writer and
+              return 202 with a job_id to poll at /api/question_status/<job_id>
     
     Returns:
         flask.Response(application/json):
             201 with {"status": "created", "question_id": <int>, "file": {...}, "data": {...}} if successful
+            202 with {"status": "queued", "job_id": "...", "status_url": "..."} when async=1
             400 with {"error": "missing_field", ...} when required field inputs are not present.
             404 with {"error": "file_not_found"} when file_id is invalid.
-            500 with {"error": "insert_failed", "message": "..."} if error in database.
+            500 with {"error": "insert_failed"} if error in database.
+            503 with {"error": "queue_full"} when async=1 and too many inserts are waiting.
 
     Raises:
         Input and database error are handled and returned as 4xx/5xx flask responses.
@@ -1511,7 +2777,8 @@ def addquestion():
 
     # Required fields: find file_id or create it from metadata
     file_id = payload.get("file_id")
-    if not (file_id and isinstance(file_id, int)):
+    file_id_given = bool(file_id and isinstance(file_id, int))
+    if not file_id_given:
         course = payload.get("course")
         year = payload.get("year")
         semester = payload.get("semester")
@@ -1536,136 +2803,425 @@ def addquestion():
              return jsonify({"error": "file_container_not_found", "message": "No existing file container matches the provided metadata. Consider using /api/createquestion."}), 404
 
 
-    question_type  = (payload.get("question_type") or "").strip()
-    question_stem  = (payload.get("question_stem") or "").strip()
-    
-    if not question_type:
-        return jsonify({"error": "missing_field", "field": "question_type"}), 400
-    if not question_stem:
-        return jsonify({"error": "missing_field", "field": "question_stem"}), 400
+    try:
+        fields = parse_question_payload(payload)
+    except ValueError as e:
+        error, field = e.args
+        return jsonify({"error": error, "field": field}), 400
 
-    file_row = _get_file_row(file_id)
+    file_row = _get_file_row_cached(file_id)
     if not file_row:
         return jsonify({"error": "file_not_found", "file_id": file_id}), 404
 
-    # Optional fields
-    concept_tags_raw = payload.get("concept_tags")
-    concept_tags = normalize_concept_tags(concept_tags_raw)
+    data = _question_insert_values(fields, file_id)
 
-    options_raw = payload.get("question_options")
-    options_val = []
-    if isinstance(options_raw, str):
+    if request.args.get("async", default=0, type=int) == 1:
         try:
-            options_val = json.loads(options_raw)
-        except Exception:
-            return jsonify({"error": "invalid_json", "field": "question_options"}), 400
-    else:
-        options_val = options_raw if options_raw is not None else []
-        
-    answer_raw = payload.get("question_answer")
-    if isinstance(answer_raw, (dict, list)):
-        answer_val = json.dumps(answer_raw, ensure_ascii=False)
-    else:
-        # Template 1 uses raw_answer which is not defined, Template 2 uses answer_raw. Using answer_raw.
-        answer_val = answer_raw 
-
-    # ---- Insert ----
-    insert_sql = """
-        INSERT INTO questions (
-            question_base_id, version_id, file_id,
-            question_no, page_numbers, question_type,
-            difficulty_rating_manual, difficulty_rating_model,
-            question_stem, question_stem_html,
-            question_options, question_answer,
-            page_image_paths, concept_tags,
-            last_used, created_at, updated_at
-        ) VALUES (
-            %s,%s,%s,
-            %s,%s,%s,
-            %s,%s,
-            %s,%s,
-            %s,%s,
-            %s,%s,
-            %s,%s,%s
+            job_id = _enqueue_question(data)
+        except queue.Full:
+            return jsonify({"error": "queue_full"}), 503
+        return jsonify({
+            "status": "queued",
+            "job_id": job_id,
+            "status_url": f"/api/question_status/{job_id}"
+        }), 202
+
+    if file_id_given:
+        # The payload had no metadata; report the file's own
+        course, year, semester, assessment_type = (
+            file_row["course"], file_row["year"], file_row["semester"], file_row["assessment_type"]
         )
+
+    try:
+        with _transaction() as conn, closing(conn.cursor()) as cur:
+            # Insert and set question_base_id to its own ID in one round trip
+            new_id = _insert_question(cur, data)
+    except MySQLdb.Error:
+        app.logger.exception("Failed to insert new question")
+        return jsonify({"error": "insert_failed"}), 500
+
+    return _json_response({
+        "status": "created",
+        "question_id": new_id,
+        "file": {
+            "id": file_row["id"],
+            "file_name": file_row.get("file_name"),
+            "file_path": file_row.get("file_path"),
+        },
+        "data": {
+            **_question_response_data(fields),
+            "course": course,
+            "year": year,
+            "semester": semester,
+            "assessment_type": assessment_type,
+        }
+    }, 201)
+
+# -----------------------------------------------------
+# Bulk Question Insert
+# -----------------------------------------------------
+MAX_BULK_QUESTIONS = int(os.getenv("MAX_BULK_QUESTIONS", "1000"))
+
+# Rows of one bulk INSERT carry placeholder base ids -1, -2, ... and ids from LAST_INSERT_ID()
+# up (gaps are possible with auto_increment_increment > 1). Other sessions fix their own
+# placeholders before committing, so only this batch's rows match. Read the new ids back in
+# input order, then point each row at itself as its base id
+_SET_OWN_BASE_ID_BULK_SQL = (
+    "SELECT id FROM questions WHERE question_base_id < 0 AND id >= LAST_INSERT_ID() "
+    "ORDER BY question_base_id DESC;\n"
+    "UPDATE questions SET question_base_id = id "
+    "WHERE question_base_id < 0 AND id >= LAST_INSERT_ID()"
+)
+
+def parse_question_payload(item: dict) -> dict:
     """
+    Validate and normalise the question fields of a create request in one pass
+    Shared by /addquestion, /api/createquestion and /questions/bulk
 
-    now = datetime.datetime.now()
-    
-    # Template 2 has some None/json.dumps([]) defaults that conflict with T1, 
-    # but the logic for T1 seems more complete and robust, so using T1's logic 
-    # for data values here, except where T2 has a clearer default (e.g., question_no is optional).
-    data = (
-        0, # question_base_id (will be updated below)
+    Args:
+        item (dict): Request body (or one /questions/bulk item)
+
+    Returns:
+        dict: question_type, question_stem, question_no, difficulty_rating_manual (float/None),
+            options_json/options_val, answer_val, concept_tags (JSON string/None) and concept_tags_raw
+
+    Raises:
+        ValueError: (error, field) with error "missing_field" for a missing question_type/question_stem
+            or "invalid_json" if question_options is not valid JSON
+    """
+    question_type = (item.get("question_type") or "").strip()
+    if not question_type:
+        raise ValueError("missing_field", "question_type")
+    question_stem = (item.get("question_stem") or "").strip()
+    if not question_stem:
+        raise ValueError("missing_field", "question_stem")
+
+    try:
+        options_json, options_val = normalize_question_options(item.get("question_options"))
+    except ValueError:
+        raise ValueError("invalid_json", "question_options")
+
+    answer_raw = item.get("question_answer")
+    difficulty_rating_manual = item.get("difficulty_rating_manual")
+    try:
+        # Invalid values become None rather than failing the INSERT
+        difficulty_rating_manual = float(difficulty_rating_manual) if difficulty_rating_manual not in (None, "") else None
+    except (ValueError, TypeError):
+        difficulty_rating_manual = None
+
+    concept_tags_raw = item.get("concept_tags")
+    return {
+        "question_type": question_type,
+        "question_stem": question_stem,
+        "question_no": item.get("question_no") or None,
+        "difficulty_rating_manual": difficulty_rating_manual,
+        "options_json": options_json,
+        "options_val": options_val,
+        "answer_val": _dumps(answer_raw) if isinstance(answer_raw, (dict, list)) else answer_raw,
+        "concept_tags": normalize_concept_tags(concept_tags_raw),
+        "concept_tags_raw": concept_tags_raw,
+    }
+
+def _question_insert_values(fields: dict, file_id: int) -> tuple:
+    """
+    Build the _INSERT_QUESTION_SQL values for a new version-1 question
+
+    Args:
+        fields (dict): Output of parse_question_payload
+        file_id (int): files.id the question is attached to
+
+    Returns:
+        tuple: Values in _INSERT_QUESTION_SQL column order
+    """
+    return (
+        0, # question_base_id (set to id after the INSERT)
         1, # version_id
-        file_id, # The file_id we found
-        payload.get("question_no") or None, # question_no (optional, from both)
-        json.dumps([]), # page_numbers
-        question_type,
-        payload.get("difficulty_rating_manual") or None, # difficulty_rating_manual (optional)
-        None, # difficulty_rating_model
-        question_stem,
+        file_id,
+        fields["question_no"],
+        _EMPTY_JSON_ARRAY, # page_numbers
+        fields["question_type"],
+        fields["difficulty_rating_manual"],
+        None, # difficulty_rating_model (set by the model later)
+        fields["question_stem"],
         None, # question_stem_html
-        json.dumps(options_val if options_val is not None else []),
-        answer_val,
-        json.dumps([]), # page_image_paths
-        concept_tags, # Already json string or None
+        fields["options_json"],
+        fields["answer_val"],
+        _EMPTY_JSON_ARRAY, # page_image_paths
+        fields["concept_tags"],
         None, # last_used
-        now,
-        now
     )
 
-    with closing(get_connection()) as conn:
+def _question_response_data(fields: dict) -> dict:
+    """
+    Question part of the "data" object returned by the create endpoints
+
+    Args:
+        fields (dict): Output of parse_question_payload
+
+    Returns:
+        dict: question_type, question_stem, question_options, question_answer and concept_tags (list)
+    """
+    concept_tags_raw = fields["concept_tags_raw"]
+    return {
+        "question_type": fields["question_type"],
+        "question_stem": fields["question_stem"],
+        "question_options": fields["options_val"] or [],
+        "question_answer": fields["answer_val"],
+        # return as list; reuse the client's list instead of decoding what was just encoded
+        "concept_tags": _dedupe_tags(concept_tags_raw) if isinstance(concept_tags_raw, (list, tuple)) else (parse_json_field(fields["concept_tags"]) or []),
+    }
+
+def _insert_question_rows(cur, rows: list) -> list:
+    """
+    Insert many questions with one multi-row INSERT and point each at itself as its base id
+
+    Args:
+        cur (MySQLdb cursor): Cursor on an open transaction (MULTI_STATEMENTS enabled)
+        rows (list[tuple]): Values in _INSERT_QUESTION_SQL column order; the question_base_id
+            value is replaced by the placeholders -1, -2, ... so rows do not collide on
+            (question_base_id, version_id) before the UPDATE
+
+    Returns:
+        list[int]: ids of the inserted rows, in input order
+    """
+    row_sql = "(" + ",".join(["%s"] * len(rows[0])) + ")"
+    insert_sql = _INSERT_QUESTION_PREFIX + ",".join([row_sql] * len(rows))
+    params = [v for i, r in enumerate(rows) for v in (-(i + 1), *r[1:])]
+    # One round trip: multi-row INSERT, then read back the ids and run the base-id UPDATE
+    cur.execute(f"{insert_sql};\n{_SET_OWN_BASE_ID_BULK_SQL}", params)
+    cur.nextset()
+    question_ids = [r[0] for r in cur.fetchall()]
+    while cur.nextset():
+        pass
+    return question_ids
+
+@app.route("/questions/bulk", methods=["POST"])
+def add_questions_bulk():
+    """
+    Insert many questions in one statement and one commit
+
+    Args:
+        JSON body (dict):
+            - file_id (int, optional): Default file for every question
+            - questions (list[dict]): Questions with the same fields as /addquestion
+              (question_type and question_stem required); an item may carry its own file_id
+
+    Returns:
+        flask.Response(application/json):
+            201 with {"status": "created", "count": <int>, "question_ids": [<int>, ...]} in input order
+            400 with {"error": "missing_field" | "invalid_json", "index": <int>, "field": "..."} for a bad item,
+                or {"error": "too_many_questions", "max": <int>} above MAX_BULK_QUESTIONS
+            404 with {"error": "file_not_found", "file_ids": [...]} if a file_id does not exist
+            500 with {"error": "insert_failed"} if error in database. Nothing is inserted.
+
+    Raises:
+        Input and database error are handled and returned as 4xx/5xx flask responses.
+    """
+    payload = request.get_json(silent=True) or {}
+    items = payload.get("questions")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "missing_field", "field": "questions"}), 400
+    if len(items) > MAX_BULK_QUESTIONS:
+        return jsonify({"error": "too_many_questions", "max": MAX_BULK_QUESTIONS}), 400
+
+    default_file_id = payload.get("file_id")
+    rows = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            return jsonify({"error": "invalid_item", "index": i}), 400
+        file_id = item.get("file_id") or default_file_id
+        if not isinstance(file_id, int):
+            return jsonify({"error": "missing_field", "index": i, "field": "file_id"}), 400
         try:
-            cur = conn.cursor()
-            cur.execute(insert_sql, data)
-            new_id = cur.lastrowid
+            fields = parse_question_payload(item)
+        except ValueError as e:
+            error, field = e.args
+            return jsonify({"error": error, "index": i, "field": field}), 400
+        rows.append(_question_insert_values(fields, file_id))
 
-            # Set question_base_id to its own ID
-            cur.execute(
-                "UPDATE questions SET question_base_id = %s WHERE id = %s",
-                (new_id, new_id)
-            )
-            conn.commit()
+    file_ids = sorted({r[2] for r in rows})
 
-            # For the response, we need the file's original metadata if it wasn't provided in the payload
-            # (which is the case if file_id was provided), so we re-fetch if needed.
-            if not all([payload.get("course"), payload.get("year"), payload.get("semester"), payload.get("assessment_type")]):
-                 cur.execute("SELECT course, year, semester, assessment_type FROM files WHERE id = %s", (file_id,))
-                 f_meta = cur.fetchone()
-                 if f_meta:
-                     course, year, semester, assessment_type = f_meta
-                
-            return jsonify({
-                "status": "created",
-                "question_id": new_id,
-                "file": {
-                    "id": file_row["id"],
-                    "file_name": file_row.get("file_name"),
-                    "file_path": file_row.get("file_path"),
-                },
-                "data": {
-                    "question_type": question_type,
-                    "question_stem": question_stem,
-                    "question_options": options_val or [],
-                    "question_answer": answer_val,
-                    "concept_tags": parse_json_field(concept_tags) or [], # return as list
-                    "course": course,
-                    "year": year,
-                    "semester": semester,
-                    "assessment_type": assessment_type,
-                }
-            }), 201
+    missing = []
+    try:
+        with _transaction() as conn, closing(conn.cursor()) as cur:
+            cur.execute(f"SELECT id FROM files WHERE id IN ({','.join(['%s'] * len(file_ids))})", file_ids)
+            missing = sorted(set(file_ids) - {r[0] for r in cur.fetchall()})
+            if not missing:
+                question_ids = _insert_question_rows(cur, rows)
+    except MySQLdb.Error:
+        app.logger.exception("Failed to bulk insert questions")
+        return jsonify({"error": "insert_failed"}), 500
 
-        except Exception as e:
-            conn.rollback()
-            app.logger.error(f"Failed to insert new question: {e}")
-            return jsonify({"error": "insert_failed", "message": str(e)}), 500    
+    if missing:
+        return jsonify({"error": "file_not_found", "file_ids": missing}), 404
+
+    return _json_response({"status": "created", "count": len(question_ids), "question_ids": question_ids}, 201)
+
+# -----------------------------------------------------
+# Queued Question Writer (/addquestion?async=1)
+# -----------------------------------------------------
+# Queued inserts are grouped into one multi-row INSERT per batch. The queue is in memory,
+# so items not yet written are lost if the worker is killed before its exit handler runs.
+QUEUED_WRITE_BATCH = int(os.getenv("QUEUED_WRITE_BATCH", "500"))
+QUEUED_WRITE_WAIT = float(os.getenv("QUEUED_WRITE_WAIT_MS", "50")) / 1000
+_QUESTION_QUEUE = queue.Queue(maxsize=int(os.getenv("QUEUED_WRITE_MAX", "10000")))
+_question_writer = None
+_question_writer_lock = threading.Lock()
+
+def _flush_queued_questions(batch: list) -> None:
+    """
+    Insert a batch of queued questions in one transaction and record each job's outcome
+    If the batch fails, rows are retried one by one so one bad row does not fail the rest
+
+    Args:
+        batch (list[tuple]): (job_id, values) pairs; values in _INSERT_QUESTION_SQL column order
+    """
+    rows = [values for _, values in batch]
+    try:
+        with _transaction() as conn, closing(conn.cursor()) as cur:
+            question_ids = _insert_question_rows(cur, rows)
+    except MySQLdb.Error:
+        app.logger.exception(f"Queued batch insert of {len(batch)} questions failed, retrying singly")
+    else:
+        for (job_id, _), new_id in zip(batch, question_ids):
+            _write_job(job_id, {"status": "done", "question_id": new_id})
+        return
+
+    for job_id, values in batch:
+        try:
+            with _transaction() as conn, closing(conn.cursor()) as cur:
+                new_id = _insert_question(cur, values)
+            _write_job(job_id, {"status": "done", "question_id": new_id})
+        except MySQLdb.Error:
+            app.logger.exception(f"Queued insert failed for job {job_id}")
+            _write_job(job_id, {"status": "failed", "error": "insert_failed"})
+
+def _question_writer_loop() -> None:
+    """
+    Drain _QUESTION_QUEUE: wait for an item, collect up to QUEUED_WRITE_BATCH items
+    or QUEUED_WRITE_WAIT seconds' worth, then flush them together. Stops at a None item.
+    """
+    stop = False
+    while not stop:
+        item = _QUESTION_QUEUE.get()
+        if item is None:
+            break
+        batch = [item]
+        deadline = time.monotonic() + QUEUED_WRITE_WAIT
+        while len(batch) < QUEUED_WRITE_BATCH:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = _QUESTION_QUEUE.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+        try:
+            _flush_queued_questions(batch)
+        except Exception:
+            # Keep the writer alive: an error it does not expect (e.g. an unwritable jobs dir)
+            # must not leave every later job queued forever
+            app.logger.exception(f"Queued writer failed on a batch of {len(batch)} questions")
+            for job_id, _ in batch:
+                try:
+                    if (_read_job(job_id) or {}).get("status") == "queued":
+                        _write_job(job_id, {"status": "failed", "error": "insert_failed"})
+                except OSError:
+                    pass
+
+def _stop_question_writer() -> None:
+    """
+    Exit handler: let the writer flush what is already queued, then stop it
+    """
+    if _question_writer is not None:
+        _QUESTION_QUEUE.put(None)
+        _question_writer.join(timeout=10)
+
+def _enqueue_question(values: tuple) -> str:
+    """
+    Queue a question INSERT for the background writer, starting the writer on first use
+    (lazily, so each gunicorn worker starts its own thread after the fork)
+
+    Args:
+        values (tuple): Values in _INSERT_QUESTION_SQL column order
+
+    Returns:
+        str: job_id to poll at /api/question_status/<job_id>
+
+    Raises:
+        queue.Full: If QUEUED_WRITE_MAX inserts are already waiting
+    """
+    global _question_writer
+    with _question_writer_lock:
+        if _question_writer is None:
+            _question_writer = threading.Thread(target=_question_writer_loop, name="question-writer", daemon=True)
+            _question_writer.start()
+            atexit.register(_stop_question_writer)
+    job_id = uuid.uuid4().hex
+    _write_job(job_id, {"status": "queued"})
+    try:
+        _QUESTION_QUEUE.put_nowait((job_id, values))
+    except queue.Full:
+        _job_path(job_id).unlink(missing_ok=True)
+        raise
+    return job_id
+
+@app.get("/api/question_status/<job_id>")
+def question_status(job_id: str):
+    """
+    Report the state of a question queued with /addquestion?async=1
+
+    Args:
+        job_id (str): Job id returned in the 202 response of /addquestion
+
+    Returns:
+        flask.Response (application/json):
+            200 with {"status": "queued" | "done" | "failed", ...}
+                once done, the body carries "question_id"
+            404 with {"error": "job_not_found"} if the job id is unknown, or finished
+                more than JOB_TTL seconds ago (default a day)
+    """
+    job = _read_job(job_id)
+    if job is None:
+        return jsonify({"error": "job_not_found", "job_id": job_id}), 404
+    return jsonify(job), 200
 
 # --# -----------------------------------------------------
 ## Question Creation (File-Independent)
 ## Unique Endpoint from Template 2
 
+# File container for a manually created question
+_INSERT_MANUAL_FILE_SQL = """
+    INSERT INTO files (course, year, semester, assessment_type, file_name, file_path)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+def _manual_file_values(payload: dict) -> tuple:
+    """
+    Build the synthetic files row for manually created questions
+
+    Args:
+        payload (dict): Request body with optional course, year, semester, assessment_type
+
+    Returns:
+        tuple: (course, year, semester, assessment_type, file_name, file_path) for
+            _INSERT_MANUAL_FILE_SQL, with a timestamped MANUAL_Q_ file name
+    """
+    timestamp_str = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+    file_name = f"MANUAL_Q_{timestamp_str}.txt"
+    return (
+        _normalize_course(payload.get("course")) or None,
+        payload.get("year") or None,
+        payload.get("semester") or None,
+        payload.get("assessment_type") or None,
+        file_name,
+        f"data/source_files/{file_name}",
+    )
+
 @app.route("/api/createquestion", methods=["POST"])
 def create_question():
     """
@@ -1700,280 +3256,156 @@ def create_question():
 
     payload = request.get_json(silent=True) or {}
     
-    # --- 1. Validate Core Question Fields ---
-    question_type = (payload.get("question_type") or "").strip()
-    question_stem = (payload.get("question_stem") or "").strip()
-    
-    if not question_type: 
-        return jsonify({"error": "missing_field", "field": "question_type"}), 400
-    if not question_stem: 
-        return jsonify({"error": "missing_field", "field": "question_stem"}), 400
-        
+    # --- 1. Validate Question Fields (before the file container is created) ---
+    try:
+        fields = parse_question_payload(payload)
+    except ValueError as e:
+        error, field = e.args
+        return jsonify({"error": error, "field": field}), 400
+
     # --- 2. Extract Optional File Metadata ---
-    course = payload.get("course") or None
-    year = payload.get("year") or None
-    semester = payload.get("semester") or None
-    assessment_type = payload.get("assessment_type") or None
-    
-    # Extracting difficulty_rating_manual
-    difficulty_rating_manual = payload.get("difficulty_rating_manual")
-    
-    # Enforce FLOAT conversion or keep None if not provided
-    if difficulty_rating_manual is not None and difficulty_rating_manual != "":
-        try:
-            difficulty_rating_manual = float(difficulty_rating_manual)
-        except (ValueError, TypeError):
-            # If the value is invalid but not None, default to None to prevent SQL crash
-            difficulty_rating_manual = None 
-    else:
-        difficulty_rating_manual = None
-    
-    # --- 3. Create Unique File Container Record ---
-    file_id = None
-    file_row = None
+    file_values = _manual_file_values(payload)
+    course, year, semester, assessment_type, file_name_default, file_path_default = file_values
     
-    with closing(get_connection()) as conn:
-        try:
-            cur = conn.cursor()
-            
-            # Insert file record 
-            insert_file_sql = """
-                INSERT INTO files (course, year, semester, assessment_type, file_name, file_path)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            
-            # Determine file name/path defaults
-            timestamp_str = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
-            file_name_default = f"MANUAL_Q_{timestamp_str}.txt" 
-            file_path_default = f"data/source_files/{file_name_default}" 
-            
-            cur.execute(
-                insert_file_sql, 
-                (
-                    course, year, semester, assessment_type, 
-                    file_name_default, file_path_default
-                )
-            )
-            conn.commit()
+    # --- 3. Create Unique File Container Record and Insert Question ---
+    # Both rows commit together, so a failed question insert leaves no empty file container
+    error = "file_creation_failed"
+
+    try:
+        with _transaction() as conn, closing(conn.cursor()) as cur:
+            cur.execute(_INSERT_MANUAL_FILE_SQL, file_values)
             file_id = cur.lastrowid
-            
-            # Fetch the newly created file row for the response payload
-            file_row = _get_file_row(file_id)
-            
-        except Exception as e:
-            conn.rollback()
-            app.logger.error(f"Failed to create synthetic file record in create_question: {e}")
-            return jsonify({"error": "file_creation_failed", "message": str(e)}), 500
-            
-    # --- 4. Prepare Question Data and Insert ---
-    
-    # Optional fields (reusing logic from above)
-    concept_tags = normalize_concept_tags(payload.get("concept_tags"))
-    
-    options_raw = payload.get("question_options")
-    options_val = []
-    if isinstance(options_raw, str):
-        try:
-            options_val = json.loads(options_raw)
-        except Exception:
-            return jsonify({"error": "invalid_json", "field": "question_options"}), 400
-    else:
-        options_val = options_raw if options_raw is not None else []
-        
-    answer_raw = payload.get("question_answer")
-    if isinstance(answer_raw, (dict, list)):
-        answer_val = json.dumps(answer_raw, ensure_ascii=False)
-    else:
-        answer_val = answer_raw # leave as scalar string/number/None
-
-    # --- Insert SQL (Fixed to include difficulty_rating_manual) ---
-    insert_sql = """
-        INSERT INTO questions (
-            question_base_id, version_id, file_id,
-            question_no, page_numbers, question_type,
-            difficulty_rating_manual, difficulty_rating_model,
-            question_stem, question_stem_html,
-            question_options, question_answer,
-            page_image_paths, concept_tags,
-            last_used, created_at, updated_at
-        ) VALUES (
-            %s,%s,%s,
-            %s,%s,%s,
-            %s,%s,
-            %s,%s,
-            %s,%s,
-            %s,%s,
-            %s,%s,%s
-        )
+
+            # Insert and set question_base_id to its own ID in one round trip
+            error = "insert_failed"
+            new_id = _insert_question(cur, _question_insert_values(fields, file_id))
+    except MySQLdb.Error:
+        app.logger.exception(f"create_question failed ({error})")
+        return jsonify({"error": error}), 500
+    _invalidate_file_ids()
+
+    # The response only needs values we just wrote, so build the row instead of re-reading it
+    file_row = {"id": file_id, "file_name": file_name_default, "file_path": file_path_default}
+
+    return _json_response({
+        "status": "created",
+        "question_id": new_id,
+        "file": {
+            "id": file_row["id"],
+            "file_name": file_row.get("file_name"),
+            "file_path": file_row.get("file_path"),
+        },
+        "data": {
+            **_question_response_data(fields),
+            "course": course,
+            "year": year,
+            "semester": semester,
+            "assessment_type": assessment_type,
+        }
+    }, 201)
+
+@app.route("/api/createquestions", methods=["POST"])
+def create_questions():
     """
-    now = datetime.datetime.now()
-    
-    data = (
-        0, # question_base_id 
-        1, # version_id
-        file_id, # The newly created file_id
-        payload.get("question_no") or None, # question_no (optional)
-        json.dumps([]), # page_numbers
-        question_type,
-        difficulty_rating_manual, # <-- Uses the GUARANTEED FLOAT or NONE value
-        None, # difficulty_rating_model (Set by ML/pipeline later)
-        question_stem,
-        None, # question_stem_html
-        json.dumps(options_val if options_val is not None else []),
-        answer_val,
-        json.dumps([]), # page_image_paths
-        concept_tags, # Already json string or None
-        None, # last_used
-        now,
-        now
-    )
-    
-    with closing(get_connection()) as conn:
-        try:
-            cur = conn.cursor()
-            cur.execute(insert_sql, data)
-            new_id = cur.lastrowid
-            
-            # Set question_base_id to its own ID
-            cur.execute(
-                "UPDATE questions SET question_base_id = %s WHERE id = %s",
-                (new_id, new_id)
-            )
-            conn.commit()
-            
-            return jsonify({
-                "status": "created",
-                "question_id": new_id,
-                "file": {
-                    "id": file_row["id"],
-                    "file_name": file_row.get("file_name"),
-                    "file_path": file_row.get("file_path"),
-                },
-                "data": {
-                    "question_type": question_type,
-                    "question_stem": question_stem,
-                    "question_options": options_val or [],
-                    "question_answer": answer_val,
-                    "concept_tags": parse_json_field(concept_tags) or [],
-                    "course": course,
-                    "year": year,
-                    "semester": semester,
-                    "assessment_type": assessment_type,
-                }
-            }), 201
-            
-        except Exception as e:
-            conn.rollback()
-            app.logger.error(f"Failed to insert new question: {e}")
-            return jsonify({"error": "insert_failed", "message": str(e)}), 500
-            
-    # --- 4. Prepare Question Data and Insert ---
-    
-    # Optional fields (reusing logic from above)
-    concept_tags = normalize_concept_tags(payload.get("concept_tags"))
-    
-    options_raw = payload.get("question_options")
-    options_val = []
-    if isinstance(options_raw, str):
-        try:
-            options_val = json.loads(options_raw)
-        except Exception:
-            return jsonify({"error": "invalid_json", "field": "question_options"}), 400
-    else:
-        options_val = options_raw if options_raw is not None else []
-        
-    answer_raw = payload.get("question_answer")
-    if isinstance(answer_raw, (dict, list)):
-        answer_val = json.dumps(answer_raw, ensure_ascii=False)
-    else:
-        answer_val = answer_raw # leave as scalar string/number/None
-
-    # --- Insert SQL (Reusing the structure from addquestion) ---
-    insert_sql = """
-        INSERT INTO questions (
-            question_base_id, version_id, file_id,
-            question_no, page_numbers, question_type,
-            difficulty_rating_manual, difficulty_rating_model,
-            question_stem, question_stem_html,
-            question_options, question_answer,
-            page_image_paths, concept_tags,
-            last_used, created_at, updated_at
-        ) VALUES (
-            %s,%s,%s,
-            %s,%s,%s,
-            %s,%s,
-            %s,%s,
-            %s,%s,
-            %s,%s,
-            %s,%s,%s
-        )
+    Bulk version of /api/createquestion: creates one synthetic file record and inserts every
+    question under it with a single multi-row INSERT, all in one transaction
+
+    Args:
+        JSON body (dict):
+            - questions (list[dict]): Questions with the same fields as /api/createquestion
+              (question_type and question_stem required)
+            - course, year, semester, assessment_type (optional): Metadata of the file record
+
+    Returns:
+        flask.Response(application/json):
+            201 with {"status": "created", "count": <int>, "question_ids": [<int>, ...],
+                "file": {"id", "file_name", "file_path"}}, question_ids in input order
+            400 with {"error": "missing_field" | "invalid_json", "index": <int>, "field": "..."} for a bad item,
+                or {"error": "too_many_questions", "max": <int>} above MAX_BULK_QUESTIONS
+            500 with {"error": "file_creation_failed" | "insert_failed"} if error in database.
+                Nothing is inserted.
+
+    Raises:
+        Input and database error are handled and returned as 4xx/5xx flask responses.
     """
-    now = datetime.datetime.now()
-    
-    # We explicitly set all other non-user-supplied fields to None/default
-    data = (
-        0, # question_base_id (will be updated below)
-        1, # version_id
-        file_id, # The newly created file_id
-        payload.get("question_no") or None, # question_no (optional)
-        json.dumps([]), # page_numbers
-        question_type,
-        payload.get("difficulty_rating_manual") or None, # difficulty_rating_manual (optional)
-        None, # difficulty_rating_model
-        question_stem,
-        None, # question_stem_html
-        json.dumps(options_val if options_val is not None else []),
-        answer_val,
-        json.dumps([]), # page_image_paths
-        concept_tags, # Already json string or None
-        None, # last_used
-        now,
-        now
-    )
-    with closing(get_connection()) as conn:
+    payload = request.get_json(silent=True) or {}
+    items = payload.get("questions")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "missing_field", "field": "questions"}), 400
+    if len(items) > MAX_BULK_QUESTIONS:
+        return jsonify({"error": "too_many_questions", "max": MAX_BULK_QUESTIONS}), 400
+
+    parsed = []
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            return jsonify({"error": "invalid_item", "index": i}), 400
         try:
-            cur = conn.cursor()
-            cur.execute(insert_sql, data)
-            new_id = cur.lastrowid
-            
-            # Set question_base_id to its own ID
-            cur.execute(
-                "UPDATE questions SET question_base_id = %s WHERE id = %s",
-                (new_id, new_id)
-            )
-            conn.commit()
-            
-            return jsonify({
-                "status": "created",
-                "question_id": new_id,
-                "file": {
-                    "id": file_row["id"],
-                    "file_name": file_row.get("file_name"),
-                    "file_path": file_row.get("file_path"),
-                },
-                # Return the data we used for clarity (including optional metadata)
-                "data": {
-                    "question_type": question_type,
-                    "question_stem": question_stem,
-                    "question_options": options_val or [],
-                    "question_answer": answer_val,
-                    "concept_tags": parse_json_field(concept_tags) or [],
-                    "course": course,
-                    "year": year,
-                    "semester": semester,
-                    "assessment_type": assessment_type,
-                }
-            }), 201
-            
-        except Exception as e:
-            conn.rollback()
-            app.logger.error(f"Failed to insert new question: {e}")
-            return jsonify({"error": "insert_failed", "message": str(e)}), 500
+            parsed.append(parse_question_payload(item))
+        except ValueError as e:
+            error, field = e.args
+            return jsonify({"error": error, "index": i, "field": field}), 400
+
+    file_values = _manual_file_values(payload)
+    error = "file_creation_failed"
+    try:
+        with _transaction() as conn, closing(conn.cursor()) as cur:
+            cur.execute(_INSERT_MANUAL_FILE_SQL, file_values)
+            file_id = cur.lastrowid
 
+            error = "insert_failed"
+            rows = [_question_insert_values(fields, file_id) for fields in parsed]
+            question_ids = _insert_question_rows(cur, rows)
+    except MySQLdb.Error:
+        app.logger.exception(f"create_questions failed ({error})")
+        return jsonify({"error": error}), 500
+    _invalidate_file_ids()
+
+    return _json_response({
+        "status": "created",
+        "count": len(question_ids),
+        "question_ids": question_ids,
+        "file": {"id": file_id, "file_name": file_values[4], "file_path": file_values[5]},
+    }, 201)
 
 # ---------------------------------------------
 # SEARCH QUESTIONS ENDPOINT (dedup by question_base_id)
 # ---------------------------------------------
+# Latest version of each question family
+# question_base_id is NOT NULL, so group on the bare column: with idx_base_latest
+# (question_base_id, id) MySQL reads one index entry per family (loose index scan)
+# instead of aggregating the whole table
+_SEARCH_LATEST_SQL = """
+    SELECT question_base_id AS gid, MAX(id) AS max_id
+    FROM questions
+    GROUP BY question_base_id
+"""
+
+# Labels, assessment types and tag arrays are normalised here so /search only copies columns
+# course_key is a stored generated column on files (course, else the file name's code prefix)
+_SEARCH_BASE_SQL = f"""
+    SELECT
+        q.id AS question_id,
+        q.question_base_id,
+        q.file_id,
+        q.question_no,
+        q.question_stem,
+        q.question_type,
+        CASE
+            WHEN q.concept_tags IS NULL THEN JSON_ARRAY()
+            WHEN JSON_TYPE(q.concept_tags) = 'ARRAY' THEN q.concept_tags
+            ELSE JSON_ARRAY(q.concept_tags)
+        END                           AS concept_tags,
+        COALESCE(f.course_key, 'UNKNOWN') AS course_key,
+        COALESCE(NULLIF(f.course_key, 'UNKNOWN'), 'Unknown') AS course,
+        f.year,
+        IF(f.assessment_type IN ('final', 'midterm', 'quiz'), f.assessment_type, 'Unknown')
+                                      AS assessment_type,
+        q.updated_at
+    FROM ({_SEARCH_LATEST_SQL}) t
+    JOIN questions q ON q.id = t.max_id
+    JOIN files     f ON f.id = q.file_id
+"""
+
 @app.route("/search", methods=["GET"])
 def search_questions():
     keyword = (request.args.get("q") or "").strip().lower()
@@ -1983,56 +3415,29 @@ def search_questions():
     academic_year = (request.args.get("academic_year") or "").strip()
     concept = (request.args.get("concept_tags") or "").strip().lower()
 
-    latest_sql = """
-        SELECT COALESCE(question_base_id, id) AS gid, MAX(id) AS max_id
-        FROM questions
-        GROUP BY COALESCE(question_base_id, id)
-    """
-
-    # Derive course_key from f.course, else from filename prefix like ST2131
-    # REGEXP_SUBSTR is available in MySQL 8
-    sql = f"""
-        SELECT
-            q.id AS question_id,
-            q.question_base_id,
-            q.file_id,
-            q.question_no,
-            q.question_stem,
-            q.question_type,
-            q.concept_tags,
-            COALESCE(
-               UPPER(NULLIF(TRIM(f.course), '')),
-               UPPER(REGEXP_SUBSTR(f.file_name, '^[A-Za-z]{{2,5}}[0-9]{{4}}'))
-            )                             AS course_key,
-            f.year,
-            LOWER(NULLIF(TRIM(f.assessment_type), '')) AS assessment_type_raw,
-            q.updated_at
-        FROM ({latest_sql}) t
-        JOIN questions q ON q.id = t.max_id
-        JOIN files     f ON f.id = q.file_id
-    """
+    sql = _SEARCH_BASE_SQL
 
     where, params = [], []
 
     if keyword:
-        where.append("(LOWER(q.question_stem) LIKE %s OR LOWER(q.concept_tags) LIKE %s)")
+        # question_stem has a case-insensitive collation; JSON text compares as binary, so
+        # concept_tags still needs LOWER()
+        where.append("(q.question_stem LIKE %s OR LOWER(q.concept_tags) LIKE %s)")
         like = f"%{keyword}%"
         params += [like, like]
 
     if qtype != "all":
-        where.append("LOWER(q.question_type) = %s")
+        where.append("q.question_type = %s")
         params.append(qtype)
 
     # Only filter by course when a *real* key comes in
     if course:
-        where.append("""COALESCE(
-               UPPER(NULLIF(TRIM(f.course), '')),
-               UPPER(REGEXP_SUBSTR(f.file_name, '^[A-Za-z]{2,5}[0-9]{4}'))
-            ) = %s""")
+        where.append("f.course_key = %s")
         params.append(course)
 
     if assessment_type:
-        where.append("LOWER(NULLIF(TRIM(f.assessment_type), '')) = %s")
+        # assessment_type is a lower-case ENUM, no normalising needed
+        where.append("f.assessment_type = %s")
         params.append(assessment_type)
 
     if academic_year:
@@ -2052,38 +3457,12 @@ def search_questions():
         cur.execute(sql, tuple(params))
         rows = cur.fetchall()
 
-    out = []
+    # course/course_key/assessment_type are normalised by the query; concept_tags is always
+    # a JSON array there, so it is embedded without decoding (see _json_column)
     for r in rows:
-        # tags → list
-        try:
-            tags = json.loads(r.get("concept_tags") or "[]")
-            if not isinstance(tags, list):
-                tags = [tags]
-        except Exception:
-            tags = [r["concept_tags"]] if r.get("concept_tags") else []
-
-        ck = r.get("course_key") or "UNKNOWN"
-        course_label = "Unknown" if ck == "UNKNOWN" else ck
-
-        atype = (r.get("assessment_type_raw") or "").lower()
-        atype = atype if atype in ("final", "midterm", "quiz") else "Unknown"
-
-        out.append({
-            "question_id": r["question_id"],
-            "question_base_id": r.get("question_base_id"),
-            "file_id": r.get("file_id"),
-            "question_no": r.get("question_no"),
-            "question_stem": r.get("question_stem"),
-            "question_type": r.get("question_type"),
-            "concept_tags": tags,
-            "course": course_label,   # display
-            "course_key": ck,         # filter key to send back
-            "year": r.get("year"),
-            "assessment_type": atype,
-            "updated_at": r.get("updated_at"),
-        })
+        r["concept_tags"] = _json_column(r["concept_tags"])
 
-    return jsonify(out)
+    return jsonify(rows)
 
 
 if __name__ == "__main__":
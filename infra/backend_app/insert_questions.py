@@ -16,7 +16,6 @@ Features:
 The module expects JSON files generated by llm_parser.py
 """
 
-from datetime import datetime
 from pathlib import Path
 import os
 import sys
@@ -108,13 +107,14 @@ def get_file_id(cursor, file_name):
         raise ValueError(f" No matching file record for {file_name}")
 
 
-def insert_question(cursor, q, file_id):
+def insert_question(cursor, q, file_id, base_placeholder=0):
     """
     Insert a single question into the database
     
     Handles all question fields including options, answers, page image paths
-    (multiple), page numbers (multiple), and metadata. Sets question_base_id 
-    equal to the new question's id for initial imports (no versions yet).
+    (multiple), page numbers (multiple), and metadata. question_base_id is
+    stored as a temporary placeholder; set_own_base_ids() points it at the
+    question's own id once the whole file has been inserted.
     
     Args:
     ----------
@@ -124,16 +124,14 @@ def insert_question(cursor, q, file_id):
         Question dictionary parsed from JSON with all required fields
     file_id : int
         Database ID of the source file this question came from
+    base_placeholder : int, default=0
+        Temporary question_base_id; must differ between questions of the same
+        file so they do not collide on (question_base_id, version_id)
         
     Returns:
     -------
     int
         The database ID of the newly inserted question
-        
-    Notes:
-    -----
-    The function also updates question_base_id to match the question id
-    since this is the first version of the question.
     """
     insert_query = """
         INSERT INTO questions (
@@ -143,9 +141,9 @@ def insert_question(cursor, q, file_id):
             question_stem, question_stem_html,
             question_options, question_answer,
             page_image_paths, concept_tags,
-            last_used, created_at, updated_at
+            last_used
         )
-        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
+        VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
     """
     
     # Ensure arrays are properly formatted
@@ -158,9 +156,9 @@ def insert_question(cursor, q, file_id):
     if not isinstance(page_image_paths, list):
         page_image_paths = [page_image_paths] if page_image_paths else []
     
-    # For initial import, question_base_id = id (will be set after insert)
+    # For initial import, question_base_id = id (set per file by set_own_base_ids)
     data = (
-        0,  # Temporary, will update after insert
+        base_placeholder,  # Temporary, will update after the file is inserted
         q.get("version_id", 1),
         file_id,
         q.get("question_no"),
@@ -175,20 +173,33 @@ def insert_question(cursor, q, file_id):
         json.dumps(page_image_paths),
         json.dumps(q.get("concept_tags", [])),
         q.get("last_used"),
-        datetime.now(),
-        datetime.now(),
-    )
+    )  # created_at/updated_at come from the column defaults
     
     cursor.execute(insert_query, data)
-    question_id = cursor.lastrowid
+    return cursor.lastrowid
+
+
+def set_own_base_ids(cursor, question_ids):
+    """
+    Set question_base_id = id for newly imported questions (no versions yet)
+    
+    One UPDATE per file instead of one per question saves a round trip
+    for every inserted question.
     
-    # Set question_base_id = id for initial imports (no versions yet)
+    Args:
+    ----------
+    cursor : mysql.connector.cursor
+        Database cursor for executing queries
+    question_ids : list of int
+        IDs returned by insert_question for the current file
+    """
+    if not question_ids:
+        return
+    placeholders = ",".join(["%s"] * len(question_ids))
     cursor.execute(
-        "UPDATE questions SET question_base_id = %s WHERE id = %s", 
-        (question_id, question_id)
+        f"UPDATE questions SET question_base_id = id WHERE id IN ({placeholders})",
+        tuple(question_ids)
     )
-    
-    return question_id
 
 
 def process_json_files():
@@ -307,8 +318,11 @@ def process_json_files():
                     print(f" Skipping {json_file}: JSON content is not a list")
                     continue # Skip if JSON is not a list of questions
 
-                for q in questions:
-                    question_id = insert_question(cursor, q, file_id)
+                inserted_ids = []
+                for i, q in enumerate(questions):
+                    # Placeholders 0, -1, -2, ... stay unique until set_own_base_ids runs
+                    question_id = insert_question(cursor, q, file_id, base_placeholder=-i)
+                    inserted_ids.append(question_id)
                     
                     # Build informative log message
                     info_parts = []
@@ -348,6 +362,7 @@ def process_json_files():
                     print(f" Inserted id={question_id} for question_no={q.get('question_no')}{extra}")
                     success_count += 1
 
+                set_own_base_ids(cursor, inserted_ids)
                 conn.commit()
                 print(f" Inserted {success_count} / {len(questions)} questions for {json_file}\n")
 
@@ -45,6 +45,9 @@ model = genai.GenerativeModel(
 
 
 # === Utility Functions ===
+_PAGE_NUMBER_RE = re.compile(r'\[PAGE_NUMBER:\s*(\d+)\]')
+_PAGE_IMAGE_RE = re.compile(r'\[PAGE_IMAGE_SAVED:\s*([^\]]+)\]')
+
 def build_page_to_image_map(full_text):
     """
     Parse an extracted PDF/text block and build a mapping from page number to
@@ -81,8 +84,8 @@ def build_page_to_image_map(full_text):
     pages = full_text.split("=== PAGE BREAK ===")
 
     for page_text in pages:
-        page_nums = re.findall(r'\[PAGE_NUMBER:\s*(\d+)\]', page_text)
-        img_paths = re.findall(r'\[PAGE_IMAGE_SAVED:\s*([^\]]+)\]', page_text)
+        page_nums = _PAGE_NUMBER_RE.findall(page_text)
+        img_paths = _PAGE_IMAGE_RE.findall(page_text)
         if page_nums:
             page_num = int(page_nums[0])
             page_map[page_num] = img_paths if img_paths else []
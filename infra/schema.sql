@@ -20,9 +20,16 @@ CREATE TABLE IF NOT EXISTS files (
   file_path TEXT,
   uploaded_by VARCHAR(128),
   uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  -- /search course key: course, else the code prefix of the file name (e.g. ST2131)
+  course_key VARCHAR(32) AS (
+    UPPER(COALESCE(NULLIF(TRIM(course), ''), REGEXP_SUBSTR(file_name, '^[A-Za-z]{2,5}[0-9]{4}')))
+  ) STORED,
   
   INDEX idx_base_version (file_base_id, file_version),
-  INDEX idx_filename (file_name)
+  INDEX idx_filename (file_name),
+  -- get_file_id lookup; uploaded_at (+ implicit id) covers the "latest" ORDER BY
+  INDEX idx_files_lookup (course, year, semester, assessment_type, uploaded_at),
+  INDEX idx_course_key (course_key)
 ) ENGINE=InnoDB;
 
 -- ──────────────────────────────────────────────
@@ -49,7 +56,10 @@ CREATE TABLE IF NOT EXISTS questions (
   updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   
   UNIQUE KEY unique_base_version (question_base_id, version_id),
-  INDEX idx_base_id (question_base_id),
+  -- latest-version lookups (/search): MAX(id) per question_base_id via loose index scan
+  INDEX idx_base_latest (question_base_id, id),
+  -- per-file fetches; question_no (+ implicit id) covers the upload result's ORDER BY
+  INDEX idx_file_question_no (file_id, question_no),
   FOREIGN KEY (file_id) REFERENCES files(id) ON DELETE CASCADE
 ) ENGINE=InnoDB;
 
@@ -83,4 +93,45 @@ CREATE TABLE IF NOT EXISTS question_versions (
   
   FOREIGN KEY (old_version_id) REFERENCES questions(id) ON DELETE CASCADE,
   FOREIGN KEY (new_version_id) REFERENCES questions(id) ON DELETE CASCADE
-) ENGINE=InnoDB;
\ No newline at end of file
+) ENGINE=InnoDB;
+
+-- ──────────────────────────────────────────────
+-- 5) Concept tag index (derived from questions.concept_tags)
+-- ──────────────────────────────────────────────
+-- One row per (question, tag) so tag filters can seek idx_tag instead of
+-- evaluating JSON_CONTAINS on every row. Kept in sync by the triggers below.
+-- utf8mb4_0900_bin keeps the exact-match semantics of JSON string comparison.
+CREATE TABLE IF NOT EXISTS question_concept_tags (
+  question_id BIGINT NOT NULL,
+  tag VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_0900_bin NOT NULL,
+  
+  PRIMARY KEY (question_id, tag),
+  INDEX idx_tag (tag),
+  FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+CREATE TRIGGER IF NOT EXISTS trg_questions_tags_ai AFTER INSERT ON questions
+FOR EACH ROW
+  INSERT IGNORE INTO question_concept_tags (question_id, tag)
+  SELECT NEW.id, jt.tag
+  FROM JSON_TABLE(NEW.concept_tags, '$[*]' COLUMNS (tag VARCHAR(255) PATH '$')) AS jt
+  WHERE jt.tag IS NOT NULL;
+
+CREATE TRIGGER IF NOT EXISTS trg_questions_tags_au_clear AFTER UPDATE ON questions
+FOR EACH ROW
+  DELETE FROM question_concept_tags
+  WHERE question_id = NEW.id AND NOT (OLD.concept_tags <=> NEW.concept_tags);
+
+CREATE TRIGGER IF NOT EXISTS trg_questions_tags_au_fill AFTER UPDATE ON questions
+FOR EACH ROW FOLLOWS trg_questions_tags_au_clear
+  INSERT IGNORE INTO question_concept_tags (question_id, tag)
+  SELECT NEW.id, jt.tag
+  FROM JSON_TABLE(NEW.concept_tags, '$[*]' COLUMNS (tag VARCHAR(255) PATH '$')) AS jt
+  WHERE jt.tag IS NOT NULL AND NOT (OLD.concept_tags <=> NEW.concept_tags);
+
+-- Backfill for databases created before this table existed
+INSERT IGNORE INTO question_concept_tags (question_id, tag)
+SELECT q.id, jt.tag
+FROM questions q,
+     JSON_TABLE(q.concept_tags, '$[*]' COLUMNS (tag VARCHAR(255) PATH '$')) AS jt
+WHERE jt.tag IS NOT NULL;
\ No newline at end of file
@@ -41,9 +41,12 @@ CREATE TABLE `files` (
   `file_path` text,
   `uploaded_by` varchar(128) DEFAULT NULL,
   `uploaded_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  `course_key` varchar(32) GENERATED ALWAYS AS (upper(coalesce(nullif(trim(`course`),_utf8mb4''),regexp_substr(`file_name`,_utf8mb4'^[A-Za-z]{2,5}[0-9]{4}')))) STORED,
   PRIMARY KEY (`id`),
   KEY `idx_base_version` (`file_base_id`,`file_version`),
-  KEY `idx_filename` (`file_name`)
+  KEY `idx_filename` (`file_name`),
+  KEY `idx_files_lookup` (`course`,`year`,`semester`,`assessment_type`,`uploaded_at`),
+  KEY `idx_course_key` (`course_key`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
 INSERT INTO `files` (`id`, `file_base_id`, `file_version`, `course`, `year`, `semester`, `assessment_type`, `file_name`, `file_path`, `uploaded_by`, `uploaded_at`) VALUES
@@ -53,6 +56,16 @@ INSERT INTO `files` (`id`, `file_base_id`, `file_version`, `course`, `year`, `se
 (4,	NULL,	1,	'ST2137',	2025,	'1',	'assessment',	'ST2137_questions.pdf',	'data/source_files/ST2137_questions.pdf',	'system_demo',	'2025-11-01 10:45:34')
 ON DUPLICATE KEY UPDATE `id` = VALUES(`id`), `file_base_id` = VALUES(`file_base_id`), `file_version` = VALUES(`file_version`), `course` = VALUES(`course`), `year` = VALUES(`year`), `semester` = VALUES(`semester`), `assessment_type` = VALUES(`assessment_type`), `file_name` = VALUES(`file_name`), `file_path` = VALUES(`file_path`), `uploaded_by` = VALUES(`uploaded_by`), `uploaded_at` = VALUES(`uploaded_at`);
 
+DROP TABLE IF EXISTS `question_concept_tags`;
+CREATE TABLE `question_concept_tags` (
+  `question_id` bigint NOT NULL,
+  `tag` varchar(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_0900_bin NOT NULL,
+  PRIMARY KEY (`question_id`,`tag`),
+  KEY `idx_tag` (`tag`),
+  CONSTRAINT `question_concept_tags_ibfk_1` FOREIGN KEY (`question_id`) REFERENCES `questions` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+
 DROP TABLE IF EXISTS `question_versions`;
 CREATE TABLE `question_versions` (
   `id` bigint NOT NULL AUTO_INCREMENT,
@@ -92,11 +105,31 @@ CREATE TABLE `questions` (
   `updated_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
   UNIQUE KEY `unique_base_version` (`question_base_id`,`version_id`),
-  KEY `idx_base_id` (`question_base_id`),
-  KEY `file_id` (`file_id`),
+  KEY `idx_base_latest` (`question_base_id`,`id`),
+  KEY `idx_file_question_no` (`file_id`,`question_no`),
   CONSTRAINT `questions_ibfk_1` FOREIGN KEY (`file_id`) REFERENCES `files` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
+DELIMITER ;;
+
+CREATE TRIGGER `trg_questions_tags_ai` AFTER INSERT ON `questions` FOR EACH ROW
+INSERT IGNORE INTO question_concept_tags (question_id, tag)
+  SELECT NEW.id, jt.tag
+  FROM JSON_TABLE(NEW.concept_tags, '$[*]' COLUMNS (tag VARCHAR(255) PATH '$')) AS jt
+  WHERE jt.tag IS NOT NULL;;
+
+CREATE TRIGGER `trg_questions_tags_au_clear` AFTER UPDATE ON `questions` FOR EACH ROW
+DELETE FROM question_concept_tags
+  WHERE question_id = NEW.id AND NOT (OLD.concept_tags <=> NEW.concept_tags);;
+
+CREATE TRIGGER `trg_questions_tags_au_fill` AFTER UPDATE ON `questions` FOR EACH ROW FOLLOWS `trg_questions_tags_au_clear`
+INSERT IGNORE INTO question_concept_tags (question_id, tag)
+  SELECT NEW.id, jt.tag
+  FROM JSON_TABLE(NEW.concept_tags, '$[*]' COLUMNS (tag VARCHAR(255) PATH '$')) AS jt
+  WHERE jt.tag IS NOT NULL AND NOT (OLD.concept_tags <=> NEW.concept_tags);;
+
+DELIMITER ;
+
 INSERT INTO `questions` (`id`, `question_base_id`, `version_id`, `file_id`, `question_no`, `page_numbers`, `question_type`, `difficulty_rating_manual`, `difficulty_rating_model`, `question_stem`, `question_stem_html`, `question_options`, `question_answer`, `page_image_paths`, `concept_tags`, `last_used`, `created_at`, `updated_at`) VALUES
 (1,	1,	1,	1,	'1(a)',	'[2]',	'open-ended',	NULL,	NULL,	'If we use linear regression model with intercept to predict a response y based on a regressor x given 100 observations, the average of the residuals, (1/100) Σ(i=1 to 100) e_i, will always be zero. True or False?',	NULL,	'[]',	NULL,	'[\"data/question_media/DSA1101_Final_Sem2_2425_page2.png\"]',	'[\"linear regression\", \"residuals\", \"statistics\"]',	NULL,	'2025-11-01 10:45:34',	'2025-11-01 18:45:34'),
 (2,	2,	1,	1,	'1(b)',	'[2]',	'open-ended',	NULL,	NULL,	'If I am using House Price and Household Monthly Income (both in Singapore dollars) as two features for the K-means algorithm to divide Singapore households into groups, I do not need to standardize them since they have the same units. True or False?',	NULL,	'[]',	NULL,	'[\"data/question_media/DSA1101_Final_Sem2_2425_page2.png\"]',	'[\"k-means\", \"feature scaling\", \"clustering\"]',	NULL,	'2025-11-01 10:45:34',	'2025-11-01 18:45:34'),